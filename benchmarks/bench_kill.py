@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import psutil
+
+from die_cli import tui
+from die_cli.actions import start_action_workers
+from die_cli.kill_engine import STRATEGY_ENV, _is_gone
+
+READY_TIMEOUT = 30.0
+DEATH_TIMEOUT = 30.0
+POLL_MIN = 0.001
+POLL_MAX = 0.01
+
+NODE_SCRIPT = r"""
+import signal, subprocess, sys, time
+fanout, depth, ignore, respawn = (int(arg) for arg in sys.argv[1:5])
+if ignore:
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+children = []
+while True:
+    children = [child for child in children if child.poll() is None]
+    while depth > 0 and len(children) < fanout:
+        children.append(subprocess.Popen(
+            [sys.executable, "-c", sys.argv[5], str(fanout), str(depth - 1),
+             str(ignore), "0", sys.argv[5]]
+        ))
+    if not respawn:
+        break
+    time.sleep(0.005)
+while True:
+    time.sleep(60)
+"""
+
+SCENARIOS = {
+    "single": {"kind": "KILL", "fanout": 0, "depth": 0},
+    "wide": {"kind": "KILL_TREE", "fanout": 50, "depth": 1},
+    "deep": {"kind": "KILL_TREE", "fanout": 1, "depth": 20},
+    "bushy": {"kind": "KILL_TREE", "fanout": 3, "depth": 3},
+    "stubborn": {"kind": "KILL_TREE", "fanout": 20, "depth": 1, "ignore_term": True},
+    "respawn": {"kind": "SUPPRESS", "fanout": 10, "depth": 1, "respawn": True},
+}
+
+
+def _tree_size(fanout, depth):
+    return sum(fanout**level for level in range(depth + 1))
+
+
+def _group_members(pgid):
+    members = []
+    for pid in psutil.pids():
+        try:
+            if os.getpgid(pid) != pgid:
+                continue
+            proc = psutil.Process(pid)
+            if proc.status() != psutil.STATUS_ZOMBIE:
+                members.append(proc)
+        except Exception:
+            continue
+    return members
+
+
+def _group_alive(pgid):
+    return len(_group_members(pgid))
+
+
+def _wait_gone(pgid, members, deadline):
+    delay = POLL_MIN
+    while True:
+        members = [proc for proc in members if not _is_gone(proc)]
+        if not members:
+            members = _group_members(pgid)
+            if not members:
+                return True
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(POLL_MAX, delay * 2)
+
+
+def _spawn(spec):
+    root = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            NODE_SCRIPT,
+            str(spec["fanout"]),
+            str(spec["depth"]),
+            "1" if spec.get("ignore_term") else "0",
+            "1" if spec.get("respawn") else "0",
+            NODE_SCRIPT,
+        ],
+        start_new_session=True,
+    )
+    expected = _tree_size(spec["fanout"], spec["depth"])
+    deadline = time.monotonic() + READY_TIMEOUT
+    while _group_alive(root.pid) < expected:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"tree {root.pid} never reached {expected} processes")
+        time.sleep(0.05)
+    return root, expected
+
+
+def _job(spec, root):
+    proc = psutil.Process(root.pid)
+    job = {
+        "kind": spec["kind"],
+        "pid": root.pid,
+        "key": (root.pid, proc.create_time()),
+        "name": "bench",
+    }
+    if spec["kind"] == "KILL_TREE":
+        job["members"] = tuple(
+            (child.pid, child.create_time()) for child in proc.children(recursive=True)
+        )
+    if spec["kind"] == "SUPPRESS":
+        job["quiet"] = 0.5
+    return job
+
+
+def _cleanup(root):
+    try:
+        os.killpg(root.pid, 9)
+    except Exception:
+        pass
+    try:
+        root.wait(timeout=5)
+    except Exception:
+        pass
+
+
+def run_scenario(state, name, spec, repeat):
+    samples = []
+    killed = 0
+    timeouts = 0
+    for _ in range(repeat):
+        root, size = _spawn(spec)
+        try:
+            job = _job(spec, root)
+            members = _group_members(root.pid)
+            t0 = time.perf_counter()
+            tui._queue_action(state, job)
+            if _wait_gone(root.pid, members, time.monotonic() + DEATH_TIMEOUT):
+                samples.append(time.perf_counter() - t0)
+                killed += size
+            else:
+                timeouts += 1
+        finally:
+            _cleanup(root)
+        while sum(state.action_queue.depth()):
+            time.sleep(0.01)
+
+    ordered = sorted(samples) or [0.0]
+    total = sum(samples)
+    return {
+        "scenario": name,
+        "kind": spec["kind"],
+        "tree_size": _tree_size(spec["fanout"], spec["depth"]),
+        "runs": len(samples),
+        "timeouts": timeouts,
+        "p50_ms": statistics.median(ordered) * 1000.0,
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000.0,
+        "max_ms": ordered[-1] * 1000.0,
+        "procs_per_s": killed / total if total > 0 else 0.0,
+        "status": state.status,
+    }
+
+
+def _print_result(result):
+    print(
+        f"{result['scenario']:<10}{result['kind']:<11}{result['tree_size']:>6}"
+        f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['max_ms']:>10.1f}"
+        f"{result['procs_per_s']:>12.0f}{result['timeouts']:>9}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="die-cli kill latency benchmark (Linux)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--strategy", choices=("auto", "walk"), default=None)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    if not sys.platform.startswith("linux"):
+        parser.error("bench_kill spawns POSIX process groups and only runs on Linux")
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {','.join(unknown)}")
+    if args.strategy:
+        os.environ[STRATEGY_ENV] = args.strategy
+
+    state = tui.SharedState()
+    start_action_workers(state, args.workers)
+    results = [run_scenario(state, name, SCENARIOS[name], max(1, args.repeat)) for name in names]
+    state.running = False
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'scenario':<10}{'kind':<11}{'procs':>6}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'max ms':>10}{'procs/s':>12}{'timeouts':>9}"
+    )
+    for result in results:
+        _print_result(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rich.console import Console
+
+from benchmarks.synthetic import SyntheticBackend
+from die_cli import tui
+from die_cli.process_snapshot import Snapshot, SnapshotEngine, _resolve_username
+from die_cli.usernames import UsernameResolver
+
+WIDTH = 160
+HEIGHT = 50
+FILTER = "chrome"
+CPU_COUNT = 8
+
+
+def _measure(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return samples, result
+
+
+def _summary(samples, items):
+    mean = statistics.fmean(samples)
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "mean_ms": mean * 1000.0,
+        "p95_ms": p95 * 1000.0,
+        "items_per_s": items / mean if mean > 0 else 0.0,
+    }
+
+
+def _make_pipeline(size, churn, unknown_users):
+    backend = SyntheticBackend(size, churn=churn, unknown_users=unknown_users)
+    engine = SnapshotEngine(CPU_COUNT, backend=backend)
+    resolver = UsernameResolver(_resolve_username)
+
+    def resolve_user(key, name, raw_user):
+        return raw_user or resolver.lookup(key, name)
+
+    def collect():
+        backend.step()
+        delta = engine.tick(resolve_user)
+        resolver.forget(delta["removed"])
+        for key, user in resolver.drain():
+            engine.set_user(key, user, delta)
+        return delta
+
+    return engine, collect
+
+
+def _publish(state, engine):
+    table = engine.table()
+    rows = table.rows()
+    state.snapshot = Snapshot(engine.version, time.time(), table, rows)
+    return rows
+
+
+def bench_size(size, churn, unknown_users, ticks):
+    engine, collect = _make_pipeline(size, churn, unknown_users)
+    collect()
+
+    state = tui.SharedState()
+    console = Console(
+        color_system="truecolor",
+        force_terminal=True,
+        width=WIDTH,
+        height=HEIGHT,
+        file=open(os.devnull, "w"),
+    )
+    max_rows = tui._calc_max_rows(HEIGHT)
+    stages = {}
+
+    samples, _ = _measure(collect, ticks)
+    stages["collect"] = _summary(samples, size)
+    samples, table = _measure(engine.table, ticks)
+    stages["table"] = _summary(samples, size)
+    samples, _ = _measure(lambda: table.argsort("mem", reverse=True), ticks)
+    stages["sort"] = _summary(samples, size)
+    samples, _ = _measure(lambda: table.argsort("mem", reverse=True, head=2 * max_rows), ticks)
+    stages["top_k"] = _summary(samples, size)
+
+    rows = _publish(state, engine)
+    samples, _ = _measure(lambda: tui._apply_filter(rows, FILTER), ticks)
+    stages["filter"] = _summary(samples, size)
+
+    state.filter_text = FILTER
+
+    def build_view_new():
+        previous = state.snapshot
+        state.snapshot = Snapshot(previous.version + 1, previous.ts, previous.table, previous.rows)
+        return tui._build_view(state, max_rows)
+
+    samples, _ = _measure(build_view_new, ticks)
+    stages["build_view"] = _summary(samples, size)
+    samples, view = _measure(lambda: tui._build_view(state, max_rows), ticks)
+    stages["view_cached"] = _summary(samples, size)
+
+    def render_ui():
+        with console.capture() as capture:
+            console.print(tui._render_ui(view))
+        return capture.get()
+
+    samples, _ = _measure(render_ui, ticks)
+    stages["render_ui"] = _summary(samples, max_rows)
+    samples, _ = _measure(
+        lambda: tui._render_ansi_lines(console, view, WIDTH, HEIGHT), ticks
+    )
+    stages["render_ansi"] = _summary(samples, HEIGHT)
+
+    tracemalloc.start()
+    engine, collect = _make_pipeline(size, churn, unknown_users)
+    collect()
+    collect()
+    state = tui.SharedState()
+    _publish(state, engine)
+    tui._build_view(state, max_rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "size": size,
+        "churn": churn,
+        "ticks": ticks,
+        "peak_mb": peak / (1024 * 1024),
+        "stages": stages,
+    }
+
+
+def _print_result(result):
+    print(
+        f"== {result['size']} processes, churn {result['churn']:.1%}, "
+        f"{result['ticks']} ticks, peak {result['peak_mb']:.1f} MB"
+    )
+    print(f"{'stage':<12}{'mean ms':>10}{'p95 ms':>10}{'items/s':>14}")
+    for name, stage in result["stages"].items():
+        print(
+            f"{name:<12}{stage['mean_ms']:>10.2f}{stage['p95_ms']:>10.2f}"
+            f"{stage['items_per_s']:>14.0f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="die-cli snapshot/view pipeline benchmark")
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--churn", type=float, default=0.02)
+    parser.add_argument("--unknown-users", type=float, default=0.0)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [
+        bench_size(int(size), args.churn, args.unknown_users, max(1, args.ticks))
+        for size in args.sizes.split(",")
+        if size.strip()
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        _print_result(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import random
+
+_NAMES = [
+    "svchost.exe",
+    "chrome.exe",
+    "msedgewebview2.exe",
+    "w3wp.exe",
+    "sqlservr.exe",
+    "msbuild.exe",
+    "conhost.exe",
+    "chromedriver.exe",
+    "python.exe",
+    "node.exe",
+    "RuntimeBroker.exe",
+    "dllhost.exe",
+]
+_USERS = [
+    "SYSTEM",
+    "LOCAL SERVICE",
+    "NETWORK SERVICE",
+    "svc_sql",
+    "svc_iis",
+    "builder",
+    "operator",
+]
+
+
+class SyntheticBackend:
+    name = "synthetic"
+
+    def __init__(self, count, churn=0.0, unknown_users=0.0, seed=1234):
+        self._rng = random.Random(seed)
+        self._churn = churn
+        self._unknown_users = unknown_users
+        self._next_pid = 8
+        self._clock = 1_700_000_000.0
+        self._procs = {}
+        self._pids = []
+        for _ in range(count):
+            self._spawn()
+
+    def _spawn(self):
+        rng = self._rng
+        pid = self._next_pid
+        self._next_pid += 4
+        self._clock += 0.001
+        key = (pid, self._clock)
+        ppid = rng.choice(self._pids) if self._pids and rng.random() < 0.9 else 0
+        self._pids.append(pid)
+        name = rng.choice(_NAMES)
+        if rng.random() < self._unknown_users:
+            user = None
+        else:
+            user = rng.choice(_USERS)
+        self._procs[key] = (name, user, rng.randint(1, 2048) * 1024 * 1024, ppid)
+
+    def prime(self):
+        pass
+
+    def step(self):
+        if not self._churn or not self._procs:
+            return
+        rng = self._rng
+        count = max(1, int(len(self._procs) * self._churn))
+        for key in rng.sample(list(self._procs), count):
+            del self._procs[key]
+        for _ in range(count):
+            self._spawn()
+
+    def samples(self):
+        rng = self._rng
+        for key, proc in self._procs.items():
+            cpu = rng.random() * 100.0 if rng.random() < 0.2 else 0.0
+            yield key, proc[3], cpu, proc[2], proc
+
+    def describe(self, key, proc):
+        return proc[0], proc[1]
@@ -1,8 +1,19 @@
 import os
+import queue
+import threading
 import time
 
 import psutil
 
+from .kill_engine import kill_tree, kill_wave
+from .process_identity import PidReused, pinned_process
+from .suppress import STATUS_INTERVAL, Suppressor, quiet_period
+
+ACTION_WORKERS = 4
+BULK_MIN_CHUNK = 8
+ACTION_WORKERS_ENV = "DIE_CLI_ACTION_WORKERS"
+TREE_KINDS = ("KILL_TREE", "SUPPRESS")
+
 
 def _set_status(state, message):
     with state.lock:
@@ -10,57 +21,26 @@ def _set_status(state, message):
     state.ui_event.set()
 
 
-def _terminate_then_kill(proc):
-    try:
-        proc.terminate()
-    except psutil.NoSuchProcess:
-        return True, None
-    except Exception:
-        pass
-
-    try:
-        proc.wait(timeout=0.3)
-    except psutil.NoSuchProcess:
-        return True, None
-    except Exception:
-        pass
-
-    try:
-        if proc.is_running():
-            proc.kill()
-            proc.wait(timeout=0.5)
-    except psutil.NoSuchProcess:
-        return True, None
-    except Exception as e:
-        return False, e
-
-    try:
-        if proc.is_running():
-            return False, RuntimeError("still alive")
-    except psutil.NoSuchProcess:
-        return True, None
-    except Exception as e:
-        return False, e
-
-    return True, None
-
-
-def _kill_single(pid, name, my_pid, state):
+def _kill_single(pid, name, my_pid, state, key=None):
     if pid == my_pid:
         _set_status(state, f"NOPE: won't kill myself ({pid})")
         return
 
     try:
-        proc = psutil.Process(pid)
+        proc = pinned_process(pid, key)
+    except PidReused:
+        _set_status(state, f"SKIPPED {pid} {name} (pid reused since snapshot)")
+        return
     except Exception as e:
         _set_status(state, f"FAILED {pid} {name} (Error: {type(e).__name__}: {e})")
         return
 
-    ok, err = _terminate_then_kill(proc)
-    if ok:
-        _set_status(state, f"KILLED {pid} {name}")
+    wave = kill_wave([proc])
+    if wave.ok:
+        _set_status(state, f"KILLED {pid} {name} ({wave.summary()})")
         return
 
+    err = wave.first_error()
     if isinstance(err, RuntimeError) and str(err) == "still alive":
         _set_status(state, f"STILL ALIVE {pid} {name} (protected/respawn?)")
         return
@@ -68,59 +48,288 @@ def _kill_single(pid, name, my_pid, state):
     _set_status(state, f"FAILED {pid} {name} (Error: {type(err).__name__}: {err})")
 
 
-def _kill_tree(pid, name, my_pid, state):
+def _snapshot_members(members):
+    procs = []
+    reused = failed = 0
+    for key in members:
+        try:
+            procs.append(pinned_process(key[0], key))
+        except PidReused:
+            reused += 1
+        except psutil.NoSuchProcess:
+            continue
+        except Exception:
+            failed += 1
+    return procs, reused, failed
+
+
+def _kill_tree(pid, name, my_pid, state, members=None, key=None):
     if pid == my_pid:
         _set_status(state, f"NOPE: won't kill myself ({pid})")
         return
 
+    reused = failed = 0
     try:
-        parent = psutil.Process(pid)
-        children = parent.children(recursive=True)
+        parent = pinned_process(pid, key)
+        if members is None:
+            children = parent.children(recursive=True)
+        else:
+            children, reused, failed = _snapshot_members(members)
+    except PidReused:
+        _set_status(state, f"SKIPPED TREE {pid} {name} (pid reused since snapshot)")
+        return
     except Exception as e:
         _set_status(state, f"FAILED TREE {pid} {name} (Erro: {type(e).__name__}: {e})")
         return
 
     targets = [child for child in children if child.pid != my_pid]
-    target_count = len(targets) + 1
-
-    first_error = None
-    for child in targets:
-        ok, err = _terminate_then_kill(child)
-        if not ok and first_error is None:
-            first_error = err
+    targets.append(parent)
+    skipped = f", {reused} skipped: pid reused" if reused else ""
+    if failed:
+        skipped += f", {failed} failed: not accessible"
+    _set_status(state, f"KILLING TREE {pid} {name} ({len(targets)} procs{skipped})")
 
-    ok, err = _terminate_then_kill(parent)
-    if not ok and first_error is None:
-        first_error = err
-
-    if first_error is not None:
+    wave, strategy = kill_tree(parent, targets)
+    if not wave.ok:
+        err = wave.first_error()
         _set_status(
             state,
-            f"FAILED TREE {pid} {name} (Erro: {type(first_error).__name__}: {first_error})",
+            f"FAILED TREE {pid} {name} via {strategy} ({wave.summary()}; "
+            f"Erro: {type(err).__name__}: {err})",
         )
         return
 
-    _set_status(state, f"KILLED TREE {pid} {name} ({target_count} procs)")
+    _set_status(
+        state,
+        f"KILLED TREE {pid} {name} via {strategy} "
+        f"({len(targets)} procs, {wave.summary()}{skipped})",
+    )
+
+
+def _suppress_tree(pid, name, my_pid, state, key=None, quiet=None):
+    if pid == my_pid:
+        _set_status(state, f"NOPE: won't kill myself ({pid})")
+        return
+
+    try:
+        proc = pinned_process(pid, key)
+        key = (pid, proc.create_time())
+    except PidReused:
+        _set_status(state, f"SKIPPED SUPPRESS {pid} {name} (pid reused since snapshot)")
+        return
+    except Exception as e:
+        _set_status(state, f"FAILED SUPPRESS {pid} {name} (Error: {type(e).__name__}: {e})")
+        return
+
+    suppressor = Suppressor(key, my_pid, quiet_period() if quiet is None else quiet)
+    last_status = 0.0
+    while state.running:
+        suppressor.step()
+        if suppressor.finished():
+            break
+        if suppressor.timed_out():
+            _set_status(state, f"GAVE UP SUPPRESS {pid} {name} ({suppressor.summary()})")
+            return
+        now = time.monotonic()
+        if now - last_status >= STATUS_INTERVAL:
+            last_status = now
+            _set_status(
+                state,
+                f"SUPPRESSING {pid} {name} ({suppressor.summary()}, "
+                f"quiet {suppressor.quiet_for():.1f}s)",
+            )
+        time.sleep(suppressor.next_interval())
+
+    _set_status(state, f"SUPPRESSED {pid} {name} ({suppressor.summary()})")
+
+
+class BulkProgress:
+    def __init__(self, total):
+        self._lock = threading.Lock()
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.alive = 0
+        self.skipped = 0
+
+    def record(self, done=0, failed=0, alive=0, skipped=0):
+        with self._lock:
+            self.done += done
+            self.failed += failed
+            self.alive += alive
+            self.skipped += skipped
+            return self.status()
+
+    def status(self):
+        finished = self.done + self.failed + self.alive + self.skipped
+        label = "BULK KILLED" if finished >= self.total else "BULK KILLING"
+        text = (
+            f"{label} {finished}/{self.total}: done {self.done} "
+            f"failed {self.failed} alive {self.alive}"
+        )
+        if self.skipped:
+            text += f" skipped {self.skipped}"
+        return text
+
+
+def _kill_batch(members, my_pid, state, progress):
+    procs = []
+    done = failed = skipped = 0
+    for key in members:
+        if key[0] == my_pid:
+            skipped += 1
+            continue
+        try:
+            procs.append(pinned_process(key[0], key))
+        except PidReused:
+            skipped += 1
+        except psutil.NoSuchProcess:
+            done += 1
+        except Exception:
+            failed += 1
+
+    wave = kill_wave(procs)
+    denied = sum(1 for proc in wave.survivors if proc.pid in wave.errors)
+    failed += denied
+    alive = len(wave.survivors) - denied
+    done += len(procs) - len(wave.survivors)
+    _set_status(state, progress.record(done, failed, alive, skipped))
+
+
+def queue_bulk_kill(state, members, workers=1):
+    members = tuple(members)
+    if not members:
+        return None
+    progress = BulkProgress(len(members))
+    size = max(BULK_MIN_CHUNK, -(-len(members) // max(1, workers)))
+    for i in range(0, len(members), size):
+        state.action_queue.put(
+            {"kind": "KILL_BATCH", "members": members[i : i + size], "progress": progress}
+        )
+    _set_status(state, progress.status())
+    return progress
+
+
+def _identity(job):
+    return job.get("key") or job["pid"]
+
+
+class ActionQueue:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._covered = {}
+        self._running = set()
+        self._pending = 0
+
+    def put(self, job):
+        if job.get("kind") == "KILL_BATCH":
+            with self._lock:
+                self._pending += 1
+            self._queue.put(job)
+            return True
+        pid = _identity(job)
+        tree = job.get("kind") in TREE_KINDS
+        with self._lock:
+            if pid in self._covered:
+                return False
+            current = self._jobs.get(pid)
+            if current is not None:
+                if not tree or current.get("kind") in TREE_KINDS:
+                    return False
+                self._supersede(current)
+            if tree:
+                for member in job.get("members") or ():
+                    other = self._jobs.get(member)
+                    if other is not None and other.get("kind") not in TREE_KINDS:
+                        self._supersede(other)
+                    self._covered.setdefault(member, job)
+                self._covered[pid] = job
+            self._jobs[pid] = job
+            self._pending += 1
+        self._queue.put(job)
+        return True
+
+    def _supersede(self, job):
+        if id(job) in self._running or job.get("superseded"):
+            return
+        job["superseded"] = True
+        self._pending -= 1
+
+    def get(self, timeout=None):
+        while True:
+            job = self._queue.get(timeout=timeout)
+            with self._lock:
+                if job.get("superseded"):
+                    self._release(job)
+                    continue
+                self._pending -= 1
+                self._running.add(id(job))
+                return job
+
+    def done(self, job):
+        with self._lock:
+            self._running.discard(id(job))
+            self._release(job)
+
+    def _release(self, job):
+        if job.get("kind") == "KILL_BATCH":
+            return
+        pid = _identity(job)
+        if self._jobs.get(pid) is job:
+            del self._jobs[pid]
+        if job.get("kind") in TREE_KINDS:
+            for member in (*(job.get("members") or ()), pid):
+                if self._covered.get(member) is job:
+                    del self._covered[member]
+
+    def depth(self):
+        with self._lock:
+            return self._pending, len(self._running)
+
+
+def _worker_count(count=None):
+    if count is None:
+        try:
+            count = int(os.environ.get(ACTION_WORKERS_ENV, ACTION_WORKERS))
+        except ValueError:
+            count = ACTION_WORKERS
+    return max(1, count)
 
 
 def action_worker(state):
     my_pid = os.getpid()
+    jobs = state.action_queue
 
     while state.running:
-        job = None
-        with state.lock:
-            if state.action_queue:
-                job = state.action_queue.pop(0)
-
-        if job is None:
-            time.sleep(0.01)
+        try:
+            job = jobs.get(timeout=0.2)
+        except queue.Empty:
             continue
 
         kind = job.get("kind")
         pid = int(job.get("pid", -1))
         name = job.get("name", "?")
 
-        if kind == "KILL":
-            _kill_single(pid, name, my_pid, state)
-        elif kind == "KILL_TREE":
-            _kill_tree(pid, name, my_pid, state)
+        try:
+            if kind == "KILL":
+                _kill_single(pid, name, my_pid, state, job.get("key"))
+            elif kind == "KILL_TREE":
+                _kill_tree(pid, name, my_pid, state, job.get("members"), job.get("key"))
+            elif kind == "SUPPRESS":
+                _suppress_tree(pid, name, my_pid, state, job.get("key"), job.get("quiet"))
+            elif kind == "KILL_BATCH":
+                _kill_batch(job["members"], my_pid, state, job["progress"])
+        except Exception as e:
+            _set_status(state, f"FAILED {pid} {name} (Error: {type(e).__name__}: {e})")
+        finally:
+            jobs.done(job)
+            state.ui_event.set()
+
+
+def start_action_workers(state, count=None):
+    count = _worker_count(count)
+    state.action_workers = count
+    for _ in range(count):
+        threading.Thread(target=action_worker, args=(state,), daemon=True).start()
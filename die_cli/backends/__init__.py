@@ -0,0 +1,20 @@
+import os
+
+from .psutil_backend import PsutilBackend
+
+BACKEND_ENV = "DIE_CLI_BACKEND"
+
+
+def get_backend(name=None):
+    name = (name or os.getenv(BACKEND_ENV) or "").strip().lower()
+    if name == "psutil":
+        return PsutilBackend()
+    if name == "procfs" or (not name and os.path.isfile("/proc/self/stat")):
+        try:
+            from .procfs import ProcfsBackend
+
+            return ProcfsBackend()
+        except Exception:
+            if name == "procfs":
+                raise
+    return PsutilBackend()
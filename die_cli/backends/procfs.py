@@ -0,0 +1,104 @@
+import os
+import pwd
+import time
+
+PROC_ROOT = "/proc"
+
+
+def _read_boot_time(root):
+    with open(f"{root}/stat", "rb") as f:
+        for line in f:
+            if line.startswith(b"btime"):
+                return float(line.split()[1])
+    raise RuntimeError("btime not found in /proc/stat")
+
+
+class ProcfsBackend:
+    name = "procfs"
+
+    def __init__(self, root=PROC_ROOT):
+        self._root = root
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._boot_time = _read_boot_time(root)
+        self._prev = {}
+        self._users = None
+
+    def prime(self):
+        for _ in self.samples():
+            pass
+
+    def samples(self):
+        root = self._root
+        clock_ticks = self._clock_ticks
+        page_size = self._page_size
+        boot_time = self._boot_time
+        prev = self._prev
+        current = {}
+        now = time.monotonic()
+        for entry in os.listdir(root):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"{root}/{entry}/stat", "rb") as f:
+                    data = f.read()
+                end = data.rfind(b")")
+                fields = data[end + 2 :].split()
+                ppid = int(fields[1])
+                ticks = int(fields[11]) + int(fields[12])
+                key = (int(entry), int(fields[19]) / clock_ticks + boot_time)
+                rss = int(fields[21]) * page_size
+            except (OSError, ValueError, IndexError):
+                continue
+            last = prev.get(key)
+            cpu = 0.0
+            if last is not None and now > last[1]:
+                cpu = (ticks - last[0]) / clock_ticks / (now - last[1]) * 100.0
+            current[key] = (ticks, now)
+            yield key, ppid, cpu, rss, data[data.find(b"(") + 1 : end]
+        self._prev = current
+
+    def describe(self, key, comm):
+        pid = key[0]
+        name = comm.decode("utf-8", "replace") or "?"
+        if len(name) >= 15:
+            name = self._full_name(pid, name)
+        return name, self._user_name(self._uid(pid))
+
+    def _full_name(self, pid, comm):
+        try:
+            with open(f"{self._root}/{pid}/cmdline", "rb") as f:
+                argv0 = f.read().split(b"\0", 1)[0]
+        except OSError:
+            return comm
+        base = os.path.basename(argv0.decode("utf-8", "replace"))
+        if base.startswith(comm):
+            return base
+        return comm
+
+    def _uid(self, pid):
+        try:
+            with open(f"{self._root}/{pid}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"Uid:"):
+                        return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def _user_name(self, uid):
+        if uid is None:
+            return None
+        if self._users is None:
+            try:
+                self._users = {entry.pw_uid: entry.pw_name for entry in pwd.getpwall()}
+            except Exception:
+                self._users = {}
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        return name
@@ -0,0 +1,66 @@
+import os
+
+import psutil
+
+from ..process_identity import ppid_map as _shared_ppid_map
+
+
+def _safe_ppid(proc):
+    try:
+        return proc.ppid()
+    except Exception:
+        return 0
+
+
+class PsutilBackend:
+    name = "psutil"
+
+    def __init__(self):
+        self._ppids = {}
+
+    def prime(self):
+        for proc in psutil.process_iter():
+            try:
+                proc.cpu_percent(None)
+            except Exception:
+                pass
+
+    def _windows_ppid(self, key, proc, ppid_map):
+        ppid = self._ppids.get(key)
+        if ppid is not None:
+            return ppid, ppid_map
+        if ppid_map is None:
+            ppid_map = _shared_ppid_map()
+        ppid = ppid_map.get(key[0])
+        if ppid is None:
+            ppid = _safe_ppid(proc)
+        return ppid, ppid_map
+
+    def samples(self):
+        ppids = {}
+        ppid_map = None
+        for proc in psutil.process_iter():
+            try:
+                key = (proc.pid, proc.create_time())
+                with proc.oneshot():
+                    rss = proc.memory_info().rss
+                    cpu = proc.cpu_percent(None) if proc.pid else 0.0
+                    if os.name == "nt":
+                        ppid, ppid_map = self._windows_ppid(key, proc, ppid_map)
+                    else:
+                        ppid = _safe_ppid(proc)
+            except Exception:
+                continue
+            ppids[key] = ppid
+            yield key, ppid, cpu, rss, proc
+        self._ppids = ppids
+
+    def describe(self, key, proc):
+        name = proc.name() or "?"
+        if os.name == "nt":
+            return name, None
+        try:
+            raw_user = proc.username()
+        except Exception:
+            raw_user = None
+        return name, raw_user
@@ -0,0 +1,168 @@
+import operator
+import re
+from collections import OrderedDict
+
+TEXT_FIELDS = ("name", "user")
+NUMERIC_FIELDS = ("pid", "ppid", "cpu", "mem")
+QUERY_CACHE_SIZE = 64
+_COMPARISON = re.compile(r"^(pid|ppid|cpu|mem)(>=|<=|>|<|=)(-?\d+(?:\.\d+)?)$")
+_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+}
+
+
+class FilterError(ValueError):
+    pass
+
+
+class Term:
+    __slots__ = ("field", "kind", "value", "negate", "source")
+
+    def __init__(self, field, kind, value, negate, source):
+        self.field = field
+        self.kind = kind
+        self.value = value
+        self.negate = negate
+        self.source = source
+
+    def refines(self, other):
+        if self.source == other.source:
+            return True
+        return (
+            self.kind == other.kind == "text"
+            and self.field == other.field
+            and not self.negate
+            and not other.negate
+            and other.value in self.value
+        )
+
+    def bind(self, table):
+        columns = table.columns
+        kind = self.kind
+        if kind == "text":
+            needle = self.value
+            if self.field == "any":
+                names = columns["name_key"]
+                users = columns["user_key"]
+                pids = columns["pid_key"]
+                match = lambda i: needle in names[i] or needle in users[i] or needle in pids[i]
+            else:
+                values = columns[self.field + "_key"]
+                match = lambda i: needle in values[i]
+        elif kind == "regex":
+            search = self.value.search
+            values = columns[self.field]
+            match = lambda i: search(values[i]) is not None
+        else:
+            compare, number = self.value
+            values = columns[self.field]
+            match = lambda i: compare(values[i], number)
+        if self.negate:
+            return lambda i: not match(i)
+        return match
+
+
+def _number(text, source):
+    try:
+        return float(text) if "." in text else int(text)
+    except ValueError:
+        raise FilterError(f"not a number in '{source}'") from None
+
+
+def _parse_term(token):
+    source = token
+    negate = token.startswith("!") and len(token) > 1
+    if negate:
+        token = token[1:]
+
+    match = _COMPARISON.match(token.lower())
+    if match:
+        field, op, number = match.groups()
+        return Term(field, "compare", (_OPERATORS[op], _number(number, source)), negate, source)
+
+    field, sep, value = token.partition(":")
+    field = field.lower()
+    if sep and field in TEXT_FIELDS:
+        if value.startswith("~"):
+            try:
+                pattern = re.compile(value[1:], re.IGNORECASE)
+            except re.error as e:
+                raise FilterError(f"bad regex in '{source}': {e}") from None
+            return Term(field, "regex", pattern, negate, source)
+        return Term(field, "text", value.lower(), negate, source)
+    if sep and field in NUMERIC_FIELDS:
+        if not value:
+            return Term("any", "text", "", negate, source)
+        return Term(field, "compare", (operator.eq, _number(value, source)), negate, source)
+    return Term("any", "text", token.lower(), negate, source)
+
+
+class Query:
+    __slots__ = ("text", "terms")
+
+    def __init__(self, text, terms):
+        self.text = text
+        self.terms = terms
+
+    def narrows(self, previous):
+        if previous is None or len(self.terms) < len(previous.terms):
+            return False
+        return all(new.refines(old) for new, old in zip(self.terms, previous.terms))
+
+    def settled(self, previous):
+        count = 0
+        for new, old in zip(self.terms, previous.terms):
+            if new.source != old.source:
+                break
+            count += 1
+        return count
+
+    def filter(self, table, order, skip=0):
+        for term in self.terms[skip:]:
+            match = term.bind(table)
+            order = [i for i in order if match(i)]
+        return order
+
+
+_QUERIES = OrderedDict()
+
+
+def compile_query(text):
+    text = text.strip()
+    query = _QUERIES.get(text)
+    if query is not None:
+        _QUERIES.move_to_end(text)
+        return query
+    query = Query(text, tuple(_parse_term(token) for token in text.split()))
+    _QUERIES[text] = query
+    if len(_QUERIES) > QUERY_CACHE_SIZE:
+        _QUERIES.popitem(last=False)
+    return query
+
+
+class FilterEngine:
+    def __init__(self):
+        self._rows = None
+        self._query = None
+        self._result = None
+
+    def apply(self, rows, text):
+        if not text or not text.strip() or not rows:
+            return rows
+        query = compile_query(text)
+        if query is self._query and rows is self._rows:
+            return self._result
+        base = rows.order
+        skip = 0
+        if rows is self._rows and query.narrows(self._query):
+            base = self._result.order
+            skip = query.settled(self._query)
+        result = rows.table.rows(query.filter(rows.table, base, skip))
+        self._rows = rows
+        self._query = query
+        self._result = result
+        return result
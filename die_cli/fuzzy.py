@@ -0,0 +1,223 @@
+import heapq
+import queue
+import threading
+from operator import itemgetter
+
+from .process_identity import pinned_process
+
+FUZZY_PREFIX = "?"
+MIN_OVERLAP = 0.34
+RELATIVE_OVERLAP = 0.75
+DRAIN_BATCH = 500
+MAX_RESULTS = 500
+CMDLINE_MAX = 256
+FIELD_WEIGHTS = {"name": 1.0, "user": 0.6, "cmd": 0.5}
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _subsequence(needle, text):
+    chars = iter(text)
+    return all(ch in chars for ch in needle)
+
+
+def _score(doc, needle, overlap):
+    field, text = doc
+    if needle in text:
+        score = 2.0 + len(needle) / len(text)
+        if text.startswith(needle):
+            score += 0.5
+    elif _subsequence(needle, text):
+        score = 1.0 + overlap
+    else:
+        score = overlap
+    return score * FIELD_WEIGHTS[field]
+
+
+def _fetch_cmdline(key):
+    try:
+        return " ".join(pinned_process(key[0], key).cmdline())
+    except Exception:
+        return None
+
+
+class CmdlineFetcher:
+    def __init__(self, fetch=_fetch_cmdline):
+        self.fetch = fetch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._results = []
+        self._thread = None
+
+    def request(self, keys):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        for key in keys:
+            self._queue.put(key)
+
+    def _worker(self):
+        while True:
+            key = self._queue.get()
+            cmdline = self.fetch(key)
+            if cmdline:
+                with self._lock:
+                    self._results.append((key, cmdline))
+
+    def drain(self, limit=DRAIN_BATCH):
+        with self._lock:
+            results = self._results[:limit]
+            del self._results[:limit]
+        return results
+
+
+class FuzzyIndex:
+    def __init__(self, fetcher=None):
+        self.grams = {}
+        self.docs = {}
+        self.key_docs = {}
+        self.version = None
+        self.generation = 0
+        self.matched = 0
+        self._requested = set()
+        self.fetcher = CmdlineFetcher() if fetcher is None else fetcher
+
+    def _add(self, key, doc):
+        keys = self.docs.get(doc)
+        if keys is None:
+            keys = self.docs[doc] = set()
+            for gram in trigrams(doc[1]):
+                self.grams.setdefault(gram, set()).add(doc)
+        keys.add(key)
+        self.key_docs.setdefault(key, []).append(doc)
+
+    def _remove(self, key, doc):
+        keys = self.docs.get(doc)
+        if keys is None:
+            return
+        keys.discard(key)
+        if keys:
+            return
+        del self.docs[doc]
+        for gram in trigrams(doc[1]):
+            holders = self.grams.get(gram)
+            if holders is not None:
+                holders.discard(doc)
+                if not holders:
+                    del self.grams[gram]
+
+    def _drop(self, key):
+        self._requested.discard(key)
+        for doc in self.key_docs.pop(key, ()):
+            self._remove(key, doc)
+
+    def update(self, snapshot, delta_log):
+        changed = False
+        if snapshot.version != self.version and snapshot.table is not None:
+            deltas = [d for d in delta_log if d["version"] > (self.version or 0)]
+            cmds = None
+            if self.version is None or not deltas or deltas[0]["version"] != self.version + 1:
+                cmds = {
+                    key: [doc for doc in docs if doc[0] == "cmd"]
+                    for key, docs in self.key_docs.items()
+                }
+                self.grams = {}
+                self.docs = {}
+                self.key_docs = {}
+                touched = snapshot.table.keys
+                self._requested.intersection_update(touched)
+            else:
+                touched = set()
+                for delta in deltas:
+                    touched.update(delta["added"])
+                    touched.update(delta["removed"])
+                    touched.update(delta["changed"])
+            self._sync(snapshot, touched, cmds)
+            self.version = snapshot.version
+            changed = True
+
+        for key, cmdline in self.fetcher.drain():
+            if key in self._requested:
+                self._requested.discard(key)
+                self._add(key, ("cmd", cmdline[:CMDLINE_MAX].lower()))
+                changed = True
+        if changed:
+            self.generation += 1
+
+    def _sync(self, snapshot, keys, cmds=None):
+        table = snapshot.table
+        pid_index = snapshot.tree.pid_index
+        names = table.columns["name_key"]
+        users = table.columns["user_key"]
+        fresh = []
+        for key in keys:
+            row = pid_index.get(key[0], -1)
+            if row < 0 or table.keys[row] != key:
+                self._drop(key)
+                continue
+            wanted = (("name", names[row]), ("user", users[row]))
+            current = self.key_docs.get(key)
+            if current is None:
+                kept = cmds.get(key) if cmds else None
+                if kept:
+                    for doc in kept:
+                        self._add(key, doc)
+                elif key not in self._requested:
+                    fresh.append(key)
+            else:
+                if all(doc in current for doc in wanted):
+                    continue
+                for doc in [doc for doc in current if doc[0] != "cmd" and doc not in wanted]:
+                    current.remove(doc)
+                    self._remove(key, doc)
+            for doc in wanted:
+                if current is None or doc not in current:
+                    self._add(key, doc)
+        if fresh:
+            self._requested.update(fresh)
+            self.fetcher.request(fresh)
+
+    def search(self, text, limit=MAX_RESULTS):
+        needle = text.strip().lower()
+        self.matched = 0
+        if not needle:
+            return []
+        wanted = trigrams(needle)
+        counts = {}
+        grams = self.grams
+        for gram in wanted:
+            for doc in grams.get(gram, ()):
+                counts[doc] = counts.get(doc, 0) + 1
+
+        if not counts:
+            return []
+        need = max(1, int(len(wanted) * MIN_OVERLAP), int(max(counts.values()) * RELATIVE_OVERLAP))
+        best = {}
+        docs = self.docs
+        for doc, count in counts.items():
+            if count < need:
+                continue
+            score = _score(doc, needle, count / len(wanted))
+            for key in docs[doc]:
+                if score > best.get(key, 0.0):
+                    best[key] = score
+        self.matched = len(best)
+        if limit is None:
+            return sorted(best.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(limit, best.items(), key=itemgetter(1))
+
+    def rows(self, snapshot, text, delta_log):
+        self.update(snapshot, delta_log)
+        table = snapshot.table
+        if table is None:
+            return snapshot.rows
+        pid_index = snapshot.tree.pid_index
+        order = []
+        for key, _ in self.search(text):
+            row = pid_index.get(key[0], -1)
+            if row >= 0 and table.keys[row] == key:
+                order.append(row)
+        return table.rows(order)
@@ -0,0 +1,139 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from .process_snapshot import SNAPSHOT_INTERVAL, Collector
+
+COLUMNS = ("pid", "ppid", "name", "user", "cpu", "mem")
+DEFAULT_COLUMNS = ("pid", "name", "user", "cpu", "mem")
+FORMATS = ("json", "ndjson", "csv")
+ONCE_SAMPLE_DELAY = 0.5
+USER_SETTLE_TIMEOUT = 2.0
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="die-cli",
+        description="Print process snapshots without starting the TUI.",
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--once", action="store_true", help="print one snapshot and exit")
+    mode.add_argument(
+        "--watch",
+        nargs="?",
+        type=float,
+        const=SNAPSHOT_INTERVAL,
+        metavar="SECONDS",
+        help=f"stream snapshots every SECONDS (default {SNAPSHOT_INTERVAL:g})",
+    )
+    parser.add_argument("--format", choices=FORMATS, default=None)
+    parser.add_argument(
+        "--columns",
+        default=",".join(DEFAULT_COLUMNS),
+        help=f"comma separated subset of: {','.join(COLUMNS)}",
+    )
+    parser.add_argument("--top", type=int, default=None, metavar="N")
+    parser.add_argument("--count", type=int, default=None, metavar="N")
+    args = parser.parse_args(argv)
+
+    columns = [c.strip().lower() for c in args.columns.split(",") if c.strip()]
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown or not columns:
+        parser.error(f"unknown column(s): {','.join(unknown) or '(none)'}")
+    args.columns = columns
+    if args.format is None:
+        args.format = "json" if args.once else "ndjson"
+    if args.watch is not None and args.watch <= 0:
+        parser.error("--watch interval must be positive")
+    for name in ("top", "count"):
+        value = getattr(args, name)
+        if value is not None and value < 1:
+            parser.error(f"--{name} must be at least 1")
+    return args
+
+
+def _records(snapshot, columns, top):
+    table = snapshot["table"]
+    values = [table.columns[column] for column in columns]
+    if top is None:
+        order = table.argsort("cpu", reverse=True)
+    else:
+        top = max(0, top)
+        order = table.argsort("cpu", reverse=True, head=top)[:top] if top else []
+    cpu_pos = columns.index("cpu") if "cpu" in columns else -1
+    records = []
+    for i in order:
+        record = [column[i] for column in values]
+        if cpu_pos >= 0:
+            record[cpu_pos] = round(record[cpu_pos], 2)
+        records.append(record)
+    return records
+
+
+def _render(snapshot, args, first):
+    records = _records(snapshot, args.columns, args.top)
+    ts = round(snapshot["ts"], 3)
+    if args.format == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        if args.watch is not None:
+            if first:
+                writer.writerow(["ts", *args.columns])
+            writer.writerows([ts, *record] for record in records)
+        else:
+            writer.writerow(args.columns)
+            writer.writerows(records)
+        return buf.getvalue()
+
+    payload = {
+        "ts": ts,
+        "version": snapshot["version"],
+        "system": snapshot["system"],
+        "processes": [dict(zip(args.columns, record)) for record in records],
+    }
+    if args.format == "json" and args.watch is None:
+        return json.dumps(payload, indent=2) + "\n"
+    return json.dumps(payload, separators=(",", ":")) + "\n"
+
+
+def _settled_snapshot(collector):
+    collector.tick()
+    deadline = time.monotonic() + USER_SETTLE_TIMEOUT
+    time.sleep(ONCE_SAMPLE_DELAY)
+    while collector.resolver.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return collector.tick()
+
+
+def run(argv):
+    args = _parse_args(argv)
+    out = sys.stdout
+    try:
+        collector = Collector()
+        if args.once:
+            out.write(_render(_settled_snapshot(collector), args, True))
+            out.flush()
+            return 0
+
+        emitted = 0
+        snapshot = _settled_snapshot(collector)
+        next_at = time.monotonic()
+        while True:
+            out.write(_render(snapshot, args, emitted == 0))
+            out.flush()
+            emitted += 1
+            if args.count is not None and emitted >= args.count:
+                return 0
+            next_at += args.watch
+            time.sleep(max(0.0, next_at - time.monotonic()))
+            snapshot = collector.tick()
+    except KeyboardInterrupt:
+        return 0
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
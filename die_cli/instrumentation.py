@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STATS_HISTORY = 120
+PHASES = (
+    "services",
+    "iterate",
+    "tasklist",
+    "table",
+    "tree",
+    "system",
+    "total",
+)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class Instrumentation:
+    def __init__(self, jsonl_path=None, history=STATS_HISTORY):
+        self._lock = threading.Lock()
+        self._history = {name: deque(maxlen=history) for name in PHASES}
+        self._timings = {}
+        self._counts = {}
+        self._last_counts = {}
+        self._tick_start = None
+        self.ticks = 0
+        self._sink = None
+        if jsonl_path:
+            self._sink = open(jsonl_path, "a", encoding="utf-8", buffering=1)
+
+    def begin_tick(self):
+        self._timings = {}
+        self._counts = {}
+        self._tick_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[name] = self._timings.get(name, 0.0) + (
+                time.perf_counter() - t0
+            )
+
+    def count(self, name, value=1):
+        self._counts[name] = self._counts.get(name, 0) + value
+
+    def gauge(self, name, value):
+        self._counts[name] = value
+
+    def end_tick(self):
+        timings = self._timings
+        timings["total"] = time.perf_counter() - self._tick_start
+        with self._lock:
+            self.ticks += 1
+            for name in PHASES:
+                self._history.setdefault(name, deque(maxlen=STATS_HISTORY)).append(
+                    timings.get(name, 0.0) * 1000.0
+                )
+            self._last_counts = dict(self._counts)
+        if self._sink is not None:
+            record = {
+                "ts": round(time.time(), 3),
+                "tick": self.ticks,
+                "phases_ms": {
+                    name: round(value * 1000.0, 3) for name, value in timings.items()
+                },
+                "counts": self._counts,
+            }
+            try:
+                self._sink.write(json.dumps(record) + "\n")
+            except Exception:
+                pass
+
+    def summary(self):
+        with self._lock:
+            phases = {}
+            for name, values in self._history.items():
+                values = list(values)
+                phases[name] = {
+                    "last": values[-1] if values else 0.0,
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "max": max(values) if values else 0.0,
+                }
+            return {
+                "ticks": self.ticks,
+                "phases": phases,
+                "counts": dict(self._last_counts),
+            }
+
+    def close(self):
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except Exception:
+                pass
+            self._sink = None
+
+
+class RedrawStats:
+    def __init__(self, history=STATS_HISTORY):
+        self._frames = deque(maxlen=history)
+        self.frames = 0
+
+    def record(self, lines, size):
+        self.frames += 1
+        self._frames.append((lines, size))
+
+    def summary(self):
+        frames = list(self._frames)
+        if not frames:
+            return None
+        return {
+            "frames": self.frames,
+            "lines_last": frames[-1][0],
+            "bytes_last": frames[-1][1],
+            "lines_avg": sum(lines for lines, _ in frames) / len(frames),
+            "bytes_avg": sum(size for _, size in frames) / len(frames),
+        }
@@ -0,0 +1,239 @@
+import os
+import signal
+import time
+
+import psutil
+
+from . import win32
+from .process_identity import CREATE_TIME_TOLERANCE
+
+TERM_GRACE = 0.3
+KILL_GRACE = 0.5
+POLL_MIN = 0.005
+POLL_MAX = 0.05
+STRATEGY_ENV = "DIE_CLI_KILL_STRATEGY"
+
+
+def _is_gone(proc):
+    try:
+        if not proc.is_running():
+            return True
+        return proc.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+    except Exception:
+        return False
+
+
+def _signal_all(procs, method, errors):
+    pending = []
+    for proc in procs:
+        try:
+            getattr(proc, method)()
+        except psutil.NoSuchProcess:
+            continue
+        except Exception as e:
+            errors.setdefault(proc.pid, e)
+        pending.append(proc)
+    return pending
+
+
+def wait_all(procs, timeout):
+    deadline = time.monotonic() + timeout
+    delay = POLL_MIN
+    alive = [proc for proc in procs if not _is_gone(proc)]
+    while alive:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(POLL_MAX, delay * 2)
+        alive = [proc for proc in alive if not _is_gone(proc)]
+    return alive
+
+
+class WaveResult:
+    __slots__ = (
+        "targets",
+        "terminated",
+        "killed",
+        "survivors",
+        "errors",
+        "term_time",
+        "kill_time",
+    )
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.terminated = 0
+        self.killed = 0
+        self.survivors = []
+        self.errors = {}
+        self.term_time = 0.0
+        self.kill_time = 0.0
+
+    @property
+    def ok(self):
+        return not self.survivors
+
+    @property
+    def elapsed(self):
+        return self.term_time + self.kill_time
+
+    def first_error(self):
+        for proc in self.survivors:
+            err = self.errors.get(proc.pid)
+            if err is not None:
+                return err
+        if self.survivors:
+            return RuntimeError("still alive")
+        return None
+
+    def summary(self):
+        text = f"term {self.terminated}/{self.targets} {self.term_time:.2f}s"
+        if self.kill_time:
+            text += f", kill {self.killed} {self.kill_time:.2f}s"
+        if self.survivors:
+            text += f", {len(self.survivors)} alive"
+        return text
+
+
+def kill_wave(procs, term_grace=TERM_GRACE, kill_grace=KILL_GRACE):
+    result = WaveResult(len(procs))
+
+    t0 = time.monotonic()
+    pending = _signal_all(procs, "terminate", result.errors)
+    alive = wait_all(pending, term_grace)
+    result.terminated = len(procs) - len(alive)
+    result.term_time = time.monotonic() - t0
+    if not alive:
+        return result
+
+    t0 = time.monotonic()
+    pending = _signal_all(alive, "kill", result.errors)
+    survivors = wait_all(pending, kill_grace)
+    result.killed = len(alive) - len(survivors)
+    result.kill_time = time.monotonic() - t0
+    result.survivors = survivors
+    return result
+
+
+def _own_pgid():
+    try:
+        return os.getpgid(0)
+    except Exception:
+        return None
+
+
+def _group_leader(pid):
+    if not hasattr(os, "killpg"):
+        return None
+    try:
+        pgid = os.getpgid(pid)
+    except Exception:
+        return None
+    if pgid != pid or pgid == _own_pgid():
+        return None
+    return pgid
+
+
+def _killpg(pgid, sig):
+    try:
+        os.killpg(pgid, sig)
+        return True
+    except Exception:
+        return False
+
+
+def _group_members(pgid):
+    members = {}
+    for proc in psutil.process_iter(["ppid", "create_time", "status"]):
+        try:
+            if os.getpgid(proc.pid) != pgid:
+                continue
+        except Exception:
+            continue
+        info = proc.info
+        if info["status"] == psutil.STATUS_ZOMBIE or info["create_time"] is None:
+            continue
+        members[proc.pid] = (info["create_time"], info["ppid"])
+    return members
+
+
+def _group_is_tree(pgid, pinned):
+    members = _group_members(pgid)
+    owned = {
+        pid
+        for pid, (started, _) in members.items()
+        if pinned.get(pid) is not None and abs(pinned[pid] - started) <= CREATE_TIME_TOLERANCE
+    }
+    parents = owned | set(pinned)
+    grew = True
+    while grew:
+        grew = False
+        for pid, (_, ppid) in members.items():
+            if pid not in owned and ppid in parents:
+                owned.add(pid)
+                parents.add(pid)
+                grew = True
+    return len(owned) == len(members)
+
+
+def _kill_group(root, procs):
+    pgid = _group_leader(root.pid)
+    if pgid is None:
+        return None
+    pinned = {}
+    for proc in procs:
+        try:
+            pinned[proc.pid] = proc.create_time()
+        except Exception:
+            continue
+    if not _group_is_tree(pgid, pinned) or not _killpg(pgid, signal.SIGTERM):
+        return None
+    wave = kill_wave(procs)
+    if _group_is_tree(pgid, pinned):
+        _killpg(pgid, signal.SIGKILL)
+    return wave
+
+
+def _kill_job(procs):
+    api = win32.load()
+    if not api.available:
+        return None
+    job = api.CreateJobObjectW(None, None)
+    if not job:
+        return None
+    try:
+        assigned = 0
+        for proc in procs:
+            handle = api.OpenProcess(
+                win32.PROCESS_SET_QUOTA | win32.PROCESS_TERMINATE, False, proc.pid
+            )
+            if not handle:
+                continue
+            try:
+                if api.AssignProcessToJobObject(job, handle):
+                    assigned += 1
+            finally:
+                api.CloseHandle(handle)
+        if not assigned or not api.TerminateJobObject(job, 1):
+            return None
+        return kill_wave(procs)
+    finally:
+        api.CloseHandle(job)
+
+
+def kill_tree(root, procs, strategy=None):
+    if strategy is None:
+        strategy = os.environ.get(STRATEGY_ENV, "auto").lower()
+    if strategy != "walk":
+        if os.name == "nt":
+            wave = _kill_job(procs)
+            if wave is not None:
+                return wave, "job"
+        else:
+            wave = _kill_group(root, procs)
+            if wave is not None:
+                return wave, "pgroup"
+    return kill_wave(procs), "walk"
@@ -0,0 +1,27 @@
+import psutil
+
+CREATE_TIME_TOLERANCE = 0.02
+
+
+class PidReused(Exception):
+    pass
+
+
+def pinned_process(pid, key=None):
+    proc = psutil.Process(pid)
+    if key is not None and abs(proc.create_time() - key[1]) > CREATE_TIME_TOLERANCE:
+        raise PidReused(pid)
+    return proc
+
+
+def ppid_map():
+    fast = getattr(psutil._psplatform, "ppid_map", None)
+    if fast is not None:
+        try:
+            return fast()
+        except Exception:
+            pass
+    ppids = {}
+    for proc in psutil.process_iter(["ppid"]):
+        ppids[proc.pid] = proc.info["ppid"]
+    return ppids
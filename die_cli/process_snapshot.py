@@ -1,16 +1,25 @@
 import os
+import sys
 import time
 import ctypes
-import csv
-import io
-import subprocess
 from ctypes import wintypes
 
 import psutil
 
+from . import win32
+from .backends import get_backend
+from .instrumentation import Instrumentation
+from .process_table import ProcessTable
+from .process_tree import TreeIndex
+from .scheduler import RefreshScheduler
+from .services import ServiceUserMap
+from .tasklist import TasklistJob
+from .usernames import UsernameResolver
+
 SNAPSHOT_INTERVAL = 1.0
 TASKLIST_REFRESH = 15.0
 TASKLIST_TTL = 60.0
+CPU_SMOOTHING = 0.3
 SYSTEM_PROCESS_NAMES = {
     "system",
     "system idle process",
@@ -33,122 +42,40 @@ _WELL_KNOWN_SIDS = {
 _WELL_KNOWN_CACHE = {}
 
 
-def _prime_cpu_percent():
-    for proc in psutil.process_iter():
-        try:
-            proc.cpu_percent(None)
-        except Exception:
-            pass
-
-
 def _enable_debug_privilege():
-    if os.name != "nt":
-        return False
+    api = win32.load()
     try:
-        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-
-        OpenProcessToken = advapi32.OpenProcessToken
-        OpenProcessToken.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.HANDLE),
-        ]
-        OpenProcessToken.restype = wintypes.BOOL
-
-        LookupPrivilegeValueW = advapi32.LookupPrivilegeValueW
-        LookupPrivilegeValueW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.LPCWSTR,
-            ctypes.POINTER(wintypes.LUID),
-        ]
-        LookupPrivilegeValueW.restype = wintypes.BOOL
-
-        AdjustTokenPrivileges = advapi32.AdjustTokenPrivileges
-        AdjustTokenPrivileges.argtypes = [
-            wintypes.HANDLE,
-            wintypes.BOOL,
-            ctypes.c_void_p,
-            wintypes.DWORD,
-            ctypes.c_void_p,
-            ctypes.c_void_p,
-        ]
-        AdjustTokenPrivileges.restype = wintypes.BOOL
-
-        CloseHandle = kernel32.CloseHandle
-        CloseHandle.argtypes = [wintypes.HANDLE]
-        CloseHandle.restype = wintypes.BOOL
-
-        TOKEN_QUERY = 0x0008
-        TOKEN_ADJUST_PRIVILEGES = 0x0020
-        SE_PRIVILEGE_ENABLED = 0x00000002
-
         token = wintypes.HANDLE()
-        if not OpenProcessToken(
-            kernel32.GetCurrentProcess(),
-            TOKEN_QUERY | TOKEN_ADJUST_PRIVILEGES,
+        if not api.OpenProcessToken(
+            api.GetCurrentProcess(),
+            win32.TOKEN_QUERY | win32.TOKEN_ADJUST_PRIVILEGES,
             ctypes.byref(token),
         ):
             return False
 
-        luid = wintypes.LUID()
-        if not LookupPrivilegeValueW(None, "SeDebugPrivilege", ctypes.byref(luid)):
-            CloseHandle(token)
+        luid = win32.LUID()
+        if not api.LookupPrivilegeValueW(None, "SeDebugPrivilege", ctypes.byref(luid)):
+            api.CloseHandle(token)
             return False
 
-        class LUID_AND_ATTRIBUTES(ctypes.Structure):
-            _fields_ = [("Luid", wintypes.LUID), ("Attributes", wintypes.DWORD)]
-
-        class TOKEN_PRIVILEGES(ctypes.Structure):
-            _fields_ = [("PrivilegeCount", wintypes.DWORD), ("Privileges", LUID_AND_ATTRIBUTES)]
-
-        tp = TOKEN_PRIVILEGES(
+        tp = win32.TOKEN_PRIVILEGES(
             PrivilegeCount=1,
-            Privileges=LUID_AND_ATTRIBUTES(luid, SE_PRIVILEGE_ENABLED),
+            Privileges=win32.LUID_AND_ATTRIBUTES(luid, win32.SE_PRIVILEGE_ENABLED),
         )
-        AdjustTokenPrivileges(token, False, ctypes.byref(tp), 0, None, None)
-        CloseHandle(token)
+        api.AdjustTokenPrivileges(token, False, ctypes.byref(tp), 0, None, None)
+        api.CloseHandle(token)
         return True
     except Exception:
         return False
 
 
-def _build_service_user_map():
-    mapping = {}
-    try:
-        for svc in psutil.win_service_iter():
-            try:
-                info = svc.as_dict()
-                pid = info.get("pid")
-                user = info.get("username")
-                if pid and user:
-                    mapping[pid] = user
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return mapping
-
-
 def _lookup_account_sid(sid):
+    api = win32.load()
     try:
-        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
-        LookupAccountSidW = advapi32.LookupAccountSidW
-        LookupAccountSidW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.LPVOID,
-            wintypes.LPWSTR,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPWSTR,
-            ctypes.POINTER(wintypes.DWORD),
-            ctypes.POINTER(wintypes.DWORD),
-        ]
-        LookupAccountSidW.restype = wintypes.BOOL
-
         name_size = wintypes.DWORD(0)
         domain_size = wintypes.DWORD(0)
         sid_type = wintypes.DWORD(0)
-        LookupAccountSidW(
+        api.LookupAccountSidW(
             None,
             sid,
             None,
@@ -162,7 +89,7 @@ def _lookup_account_sid(sid):
 
         name_buf = ctypes.create_unicode_buffer(name_size.value)
         domain_buf = ctypes.create_unicode_buffer(domain_size.value)
-        if not LookupAccountSidW(
+        if not api.LookupAccountSidW(
             None,
             sid,
             name_buf,
@@ -183,15 +110,10 @@ def _lookup_account_sid(sid):
 
 
 def _win_session_id(pid):
-    if os.name != "nt":
-        return None
+    api = win32.load()
     try:
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        ProcessIdToSessionId = kernel32.ProcessIdToSessionId
-        ProcessIdToSessionId.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
-        ProcessIdToSessionId.restype = wintypes.BOOL
         session_id = wintypes.DWORD(0)
-        if not ProcessIdToSessionId(pid, ctypes.byref(session_id)):
+        if not api.ProcessIdToSessionId(pid, ctypes.byref(session_id)):
             return None
         return int(session_id.value)
     except Exception:
@@ -199,26 +121,16 @@ def _win_session_id(pid):
 
 
 def _lookup_account_from_sid_str(sid_str):
+    api = win32.load()
     try:
-        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-
-        ConvertStringSidToSidW = advapi32.ConvertStringSidToSidW
-        ConvertStringSidToSidW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.LPVOID)]
-        ConvertStringSidToSidW.restype = wintypes.BOOL
-
-        LocalFree = kernel32.LocalFree
-        LocalFree.argtypes = [wintypes.HLOCAL]
-        LocalFree.restype = wintypes.HLOCAL
-
         sid = wintypes.LPVOID()
-        if not ConvertStringSidToSidW(sid_str, ctypes.byref(sid)):
+        if not api.ConvertStringSidToSidW(sid_str, ctypes.byref(sid)):
             return None
         try:
             return _lookup_account_sid(sid)
         finally:
             if sid:
-                LocalFree(sid)
+                api.LocalFree(sid)
     except Exception:
         return None
 
@@ -233,111 +145,45 @@ def _well_known_account_name(kind):
 
 
 def _win_username_from_pid(pid):
-    if os.name != "nt":
-        return None
+    api = win32.load()
     try:
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
-
-        OpenProcess = kernel32.OpenProcess
-        OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
-        OpenProcess.restype = wintypes.HANDLE
-
-        OpenProcessToken = advapi32.OpenProcessToken
-        OpenProcessToken.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.HANDLE),
-        ]
-        OpenProcessToken.restype = wintypes.BOOL
-
-        GetTokenInformation = advapi32.GetTokenInformation
-        GetTokenInformation.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-        ]
-        GetTokenInformation.restype = wintypes.BOOL
-
-        CloseHandle = kernel32.CloseHandle
-        CloseHandle.argtypes = [wintypes.HANDLE]
-        CloseHandle.restype = wintypes.BOOL
-
-        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-        TOKEN_QUERY = 0x0008
-        TokenUser = 1
-
-        class SID_AND_ATTRIBUTES(ctypes.Structure):
-            _fields_ = [("Sid", wintypes.LPVOID), ("Attributes", wintypes.DWORD)]
-
-        class TOKEN_USER(ctypes.Structure):
-            _fields_ = [("User", SID_AND_ATTRIBUTES)]
-
-        proc_handle = OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        proc_handle = api.OpenProcess(win32.PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
         if not proc_handle:
             return None
 
         token_handle = wintypes.HANDLE()
-        if not OpenProcessToken(proc_handle, TOKEN_QUERY, ctypes.byref(token_handle)):
-            CloseHandle(proc_handle)
+        if not api.OpenProcessToken(proc_handle, win32.TOKEN_QUERY, ctypes.byref(token_handle)):
+            api.CloseHandle(proc_handle)
             return None
 
         needed = wintypes.DWORD(0)
-        GetTokenInformation(token_handle, TokenUser, None, 0, ctypes.byref(needed))
+        api.GetTokenInformation(token_handle, win32.TokenUser, None, 0, ctypes.byref(needed))
         if not needed.value:
-            CloseHandle(token_handle)
-            CloseHandle(proc_handle)
+            api.CloseHandle(token_handle)
+            api.CloseHandle(proc_handle)
             return None
 
         buf = ctypes.create_string_buffer(needed.value)
-        if not GetTokenInformation(
-            token_handle, TokenUser, buf, needed, ctypes.byref(needed)
+        if not api.GetTokenInformation(
+            token_handle, win32.TokenUser, buf, needed, ctypes.byref(needed)
         ):
-            CloseHandle(token_handle)
-            CloseHandle(proc_handle)
+            api.CloseHandle(token_handle)
+            api.CloseHandle(proc_handle)
             return None
 
-        token_user = ctypes.cast(buf, ctypes.POINTER(TOKEN_USER)).contents
+        token_user = ctypes.cast(buf, ctypes.POINTER(win32.TOKEN_USER)).contents
         sid = token_user.User.Sid
 
-        CloseHandle(token_handle)
-        CloseHandle(proc_handle)
+        api.CloseHandle(token_handle)
+        api.CloseHandle(proc_handle)
         return _lookup_account_sid(sid)
     except Exception:
         return None
 
 
 def _win_session_username(pid):
-    if os.name != "nt":
-        return None
+    api = win32.load()
     try:
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        wtsapi32 = ctypes.WinDLL("wtsapi32", use_last_error=True)
-
-        ProcessIdToSessionId = kernel32.ProcessIdToSessionId
-        ProcessIdToSessionId.argtypes = [wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
-        ProcessIdToSessionId.restype = wintypes.BOOL
-
-        WTSQuerySessionInformationW = wtsapi32.WTSQuerySessionInformationW
-        WTSQuerySessionInformationW.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.LPWSTR),
-            ctypes.POINTER(wintypes.DWORD),
-        ]
-        WTSQuerySessionInformationW.restype = wintypes.BOOL
-
-        WTSFreeMemory = wtsapi32.WTSFreeMemory
-        WTSFreeMemory.argtypes = [wintypes.LPVOID]
-        WTSFreeMemory.restype = None
-
-        WTS_CURRENT_SERVER_HANDLE = wintypes.HANDLE(0)
-        WTSUserName = 5
-        WTSDomainName = 7
-
         session_id = _win_session_id(pid)
         if session_id is None:
             return None
@@ -345,8 +191,8 @@ def _win_session_username(pid):
         def _query(info_class):
             buf = wintypes.LPWSTR()
             size = wintypes.DWORD(0)
-            if not WTSQuerySessionInformationW(
-                WTS_CURRENT_SERVER_HANDLE,
+            if not api.WTSQuerySessionInformationW(
+                win32.WTS_CURRENT_SERVER_HANDLE,
                 session_id,
                 info_class,
                 ctypes.byref(buf),
@@ -356,10 +202,10 @@ def _win_session_username(pid):
             try:
                 return buf.value or ""
             finally:
-                WTSFreeMemory(buf)
+                api.WTSFreeMemory(buf)
 
-        user = _query(WTSUserName)
-        domain = _query(WTSDomainName)
+        user = _query(win32.WTSUserName)
+        domain = _query(win32.WTSDomainName)
         if not user:
             return None
         if domain:
@@ -370,51 +216,18 @@ def _win_session_username(pid):
 
 
 def _win_owner_from_pid(pid):
-    if os.name != "nt":
-        return None
+    api = win32.load()
     try:
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
-
-        OpenProcess = kernel32.OpenProcess
-        OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
-        OpenProcess.restype = wintypes.HANDLE
-
-        GetSecurityInfo = advapi32.GetSecurityInfo
-        GetSecurityInfo.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.LPVOID),
-            ctypes.POINTER(wintypes.LPVOID),
-            ctypes.POINTER(wintypes.LPVOID),
-            ctypes.POINTER(wintypes.LPVOID),
-            ctypes.POINTER(wintypes.LPVOID),
-        ]
-        GetSecurityInfo.restype = wintypes.DWORD
-
-        CloseHandle = kernel32.CloseHandle
-        CloseHandle.argtypes = [wintypes.HANDLE]
-        CloseHandle.restype = wintypes.BOOL
-
-        LocalFree = kernel32.LocalFree
-        LocalFree.argtypes = [wintypes.HLOCAL]
-        LocalFree.restype = wintypes.HLOCAL
-
-        READ_CONTROL = 0x00020000
-        SE_KERNEL_OBJECT = 6
-        OWNER_SECURITY_INFORMATION = 0x00000001
-
-        proc_handle = OpenProcess(READ_CONTROL, False, pid)
+        proc_handle = api.OpenProcess(win32.READ_CONTROL, False, pid)
         if not proc_handle:
             return None
 
         owner_sid = wintypes.LPVOID()
         security_desc = wintypes.LPVOID()
-        status = GetSecurityInfo(
+        status = api.GetSecurityInfo(
             proc_handle,
-            SE_KERNEL_OBJECT,
-            OWNER_SECURITY_INFORMATION,
+            win32.SE_KERNEL_OBJECT,
+            win32.OWNER_SECURITY_INFORMATION,
             ctypes.byref(owner_sid),
             None,
             None,
@@ -427,24 +240,24 @@ def _win_owner_from_pid(pid):
             user = _lookup_account_sid(owner_sid)
 
         if security_desc:
-            LocalFree(security_desc)
-        CloseHandle(proc_handle)
+            api.LocalFree(security_desc)
+        api.CloseHandle(proc_handle)
         return user
     except Exception:
         return None
 
 
-def _resolve_username(pid, name, raw_user, cache, service_users):
-    if raw_user:
-        return raw_user
-    cached = cache.get(pid)
-    if cached and cached.get("name") == name:
-        return cached.get("user")
-    if service_users and pid in service_users:
-        user = service_users.get(pid)
-        cache[pid] = {"name": name, "user": user}
-        return user
-    user = _win_username_from_pid(pid)
+def _psutil_username(pid):
+    try:
+        return psutil.Process(pid).username()
+    except Exception:
+        return None
+
+
+def _resolve_username(pid, name):
+    user = _psutil_username(pid)
+    if not user:
+        user = _win_username_from_pid(pid)
     if not user:
         user = _win_owner_from_pid(pid)
     if not user:
@@ -462,128 +275,189 @@ def _resolve_username(pid, name, raw_user, cache, service_users):
             user = _well_known_account_name("SYSTEM")
         else:
             user = "UNKNOWN"
-    cache[pid] = {"name": name, "user": user}
     return user
 
 
-def _query_tasklist_usernames():
-    if os.name != "nt":
-        return {}
-    result = {}
-    cmd = ["tasklist", "/V", "/FO", "CSV"]
-    try:
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-    except Exception:
-        return result
-    output = proc.stdout.strip()
-    if not output:
-        return result
-    try:
-        reader = csv.reader(io.StringIO(output))
-        header = next(reader, None)
-        for row in reader:
-            if len(row) < 7:
-                continue
+class ProcessRecord:
+    __slots__ = (
+        "key",
+        "pid",
+        "ppid",
+        "started",
+        "name",
+        "user",
+        "cpu",
+        "cpu_avg",
+        "mem",
+        "name_key",
+        "user_key",
+        "pid_key",
+    )
+
+    def __init__(self, key, ppid, name, user, cpu, mem):
+        self.key = key
+        self.pid = key[0]
+        self.ppid = ppid
+        self.started = key[1]
+        self.name = name
+        self.name_key = sys.intern(name.lower())
+        self.pid_key = str(key[0])
+        self.set_user(user)
+        self.cpu = cpu
+        self.cpu_avg = cpu
+        self.mem = mem
+
+    def set_user(self, user):
+        self.user = user
+        self.user_key = sys.intern(user.lower())
+
+
+def _short_user(user):
+    if "\\" in user:
+        user = user.split("\\")[-1]
+    return sys.intern(user)
+
+
+class SnapshotEngine:
+    def __init__(self, cpu_count, backend=None):
+        self.cpu_count = cpu_count
+        self.backend = backend or get_backend()
+        self.entries = {}
+        self.version = 0
+        self._added = set()
+
+    def _cpu(self, pid, cpu):
+        if pid == 0:
+            return 0.0
+        cpu = cpu / self.cpu_count
+        if cpu < 0:
+            return 0.0
+        if cpu > 100:
+            return 100.0
+        return cpu
+
+    def _describe(self, key, handle, resolve_user):
+        name, raw_user = self.backend.describe(key, handle)
+        name = sys.intern(name or "?")
+        user = _short_user(resolve_user(key, name, raw_user))
+        return name, user
+
+    def tick(self, resolve_user):
+        entries = {}
+        added = []
+        changed = []
+
+        for key, ppid, cpu, rss, handle in self.backend.samples():
             try:
-                pid = int(row[1])
+                mem = rss // (1024 * 1024)
+                cpu = self._cpu(key[0], cpu)
+                record = self.entries.get(key)
+                if record is None:
+                    name, user = self._describe(key, handle, resolve_user)
+                    record = ProcessRecord(key, ppid, name, user, cpu, mem)
+                    added.append(key)
+                else:
+                    record.cpu_avg += CPU_SMOOTHING * (cpu - record.cpu_avg)
+                    if record.cpu != cpu or record.mem != mem or record.ppid != ppid:
+                        record.cpu = cpu
+                        record.mem = mem
+                        record.ppid = ppid
+                        changed.append(key)
+                entries[key] = record
             except Exception:
-                pid = 0
-            user = (row[6] or "").strip()
-            if not pid or not user:
-                continue
-            if user.upper() in {"N/A", "N/D"}:
                 continue
-            result[pid] = user
-    except Exception:
-        return result
-    return result
-
-
-def collect_snapshot(state):
-    cpu_count = psutil.cpu_count(logical=True) or 1
-    _prime_cpu_percent()
-    _enable_debug_privilege()
-    last_net = psutil.net_io_counters()
-    last_net_time = time.time()
-    system_drive = os.getenv("SystemDrive", "C:") + "\\"
-    boot_time = psutil.boot_time()
-    user_cache = {}
-    tasklist_cache = {}
-    tasklist_last_query = 0.0
 
-    while state.running:
-        t0 = time.time()
-        rows = []
-        service_users = _build_service_user_map()
-        unknown_pids = []
-
-        for proc in psutil.process_iter(
-            attrs=["pid", "name", "username", "memory_info"]
-        ):
-            try:
-                pid = proc.info["pid"]
-                name = proc.info.get("name") or "?"
-                user = _resolve_username(
-                    pid, name, proc.info.get("username"), user_cache, service_users
-                )
-                if "\\" in user:
-                    user = user.split("\\")[-1]
-                mem = proc.info["memory_info"].rss // (1024 * 1024)
+        removed = [key for key in self.entries if key not in entries]
+        self.entries = entries
+        self._added = set(added)
+        self.version += 1
+        return {
+            "version": self.version,
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+        }
+
+    def set_user(self, key, user, delta=None):
+        record = self.entries.get(key)
+        user = _short_user(user)
+        if record is None or record.user == user:
+            return False
+        record.set_user(user)
+        if delta is not None and key not in self._added:
+            delta["changed"].append(key)
+        return True
 
-                if pid == 0:
-                    cpu = 0.0
-                else:
-                    cpu = proc.cpu_percent(None) / cpu_count
-                    if cpu < 0:
-                        cpu = 0.0
-                    elif cpu > 100:
-                        cpu = 100.0
-
-                rows.append(
-                    {
-                        "pid": pid,
-                        "name": name,
-                        "user": user,
-                        "cpu": cpu,
-                        "mem": mem,
-                    }
-                )
-                if user == "UNKNOWN":
-                    unknown_pids.append(pid)
-            except Exception:
+    def table(self):
+        return ProcessTable.from_records(list(self.entries.values()))
+
+
+class Collector:
+    def __init__(self, instrumentation=None, backend=None):
+        self.stats = instrumentation or Instrumentation()
+        cpu_count = psutil.cpu_count(logical=True) or 1
+        self.engine = SnapshotEngine(cpu_count, backend=backend)
+        self.engine.backend.prime()
+        _enable_debug_privilege()
+        self.resolver = UsernameResolver(_resolve_username)
+        self.services = ServiceUserMap()
+        self.tasklist = TasklistJob()
+        self.scheduler = RefreshScheduler(SNAPSHOT_INTERVAL)
+        self._tasklist_cache = {}
+        self._tasklist_last_query = 0.0
+        if os.name == "nt":
+            self._system_drive = os.getenv("SystemDrive", "C:") + "\\"
+        else:
+            self._system_drive = "/"
+        self._boot_time = psutil.boot_time()
+        self._last_net = psutil.net_io_counters()
+        self._last_net_time = time.time()
+        self._disk = (0.0, 0.0, 0.0)
+
+    def _resolve_user(self, key, name, raw_user):
+        self.stats.count("resolver_calls")
+        if raw_user:
+            return raw_user
+        user = self.services.lookup(key[0], name)
+        if user:
+            return user
+        return self.resolver.lookup(key, name)
+
+    def _apply_tasklist(self, delta, now):
+        engine = self.engine
+        cache = self._tasklist_cache
+        task_users = self.tasklist.drain()
+        for pid, user in task_users.items():
+            cache[pid] = {"user": user, "ts": now}
+
+        if not task_users and not self.scheduler.due("users"):
+            return
+        unknown = [
+            record for record in engine.entries.values() if record.user == "UNKNOWN"
+        ]
+        self.stats.gauge("unknown_users", len(unknown))
+        if unknown and (now - self._tasklist_last_query) >= TASKLIST_REFRESH:
+            for pid in [
+                pid for pid, cached in cache.items() if (now - cached["ts"]) > TASKLIST_TTL
+            ]:
+                del cache[pid]
+            if self.tasklist.start():
+                self._tasklist_last_query = now
+                self.stats.count("tasklist_runs")
+
+        for record in unknown:
+            cached = cache.get(record.pid)
+            if not cached:
                 continue
+            if (now - cached.get("ts", 0)) > TASKLIST_TTL:
+                continue
+            user = cached.get("user")
+            if not user:
+                continue
+            engine.set_user(record.key, user, delta)
+            self.resolver.store(record.key, user)
 
-        now = time.time()
-        if unknown_pids and (now - tasklist_last_query) >= TASKLIST_REFRESH:
-            tasklist_last_query = now
-            task_users = _query_tasklist_usernames()
-            if task_users:
-                for pid, user in task_users.items():
-                    tasklist_cache[pid] = {"user": user, "ts": now}
-
-        if unknown_pids:
-            for row in rows:
-                if row.get("user") != "UNKNOWN":
-                    continue
-                pid = row.get("pid")
-                cached = tasklist_cache.get(pid)
-                if not cached:
-                    continue
-                if (now - cached.get("ts", 0)) > TASKLIST_TTL:
-                    continue
-                user = cached.get("user")
-                if not user:
-                    continue
-                row["user"] = user
-                user_cache[pid] = {"name": row.get("name"), "user": user}
-
-        rows.sort(key=lambda r: r["cpu"], reverse=True)
-
+    def _system_metrics(self, now):
         try:
             sys_cpu = psutil.cpu_percent(None)
         except Exception:
@@ -601,49 +475,152 @@ def collect_snapshot(state):
             mem_used_gb = 0.0
             mem_percent = 0.0
 
-        try:
-            du = psutil.disk_usage(system_drive)
-            disk_total_gb = du.total / (1024 * 1024 * 1024)
-            disk_used_gb = (du.total - du.free) / (1024 * 1024 * 1024)
-            disk_percent = du.percent
-        except Exception:
-            disk_total_gb = 0.0
-            disk_used_gb = 0.0
-            disk_percent = 0.0
+        if self.scheduler.due("disk"):
+            try:
+                du = psutil.disk_usage(self._system_drive)
+                self._disk = (
+                    du.total / (1024 * 1024 * 1024),
+                    (du.total - du.free) / (1024 * 1024 * 1024),
+                    du.percent,
+                )
+            except Exception:
+                self._disk = (0.0, 0.0, 0.0)
+        disk_total_gb, disk_used_gb, disk_percent = self._disk
 
         try:
             net_now = psutil.net_io_counters()
-            dt = max(0.1, now - last_net_time)
-            down_bps = (net_now.bytes_recv - last_net.bytes_recv) / dt
-            up_bps = (net_now.bytes_sent - last_net.bytes_sent) / dt
-            last_net = net_now
-            last_net_time = now
+            dt = max(0.1, now - self._last_net_time)
+            down_bps = (net_now.bytes_recv - self._last_net.bytes_recv) / dt
+            up_bps = (net_now.bytes_sent - self._last_net.bytes_sent) / dt
+            self._last_net = net_now
+            self._last_net_time = now
         except Exception:
             down_bps = 0.0
             up_bps = 0.0
 
+        return {
+            "cpu_percent": sys_cpu,
+            "mem_total_mb": mem_total_mb,
+            "mem_used_mb": mem_used_mb,
+            "mem_used_gb": mem_used_gb,
+            "mem_percent": mem_percent,
+            "disk_total_gb": disk_total_gb,
+            "disk_used_gb": disk_used_gb,
+            "disk_percent": disk_percent,
+            "net_down_bps": down_bps,
+            "net_up_bps": up_bps,
+            "system_drive": self._system_drive,
+            "uptime_seconds": max(0, int(now - self._boot_time)),
+        }
+
+    def tick(self):
+        stats = self.stats
+        engine = self.engine
+        cpu0 = time.thread_time()
+        stats.begin_tick()
+        with stats.phase("services"):
+            if self.services.refresh_if_due():
+                stats.count("service_refreshes")
+
+        with stats.phase("iterate"):
+            delta = engine.tick(self._resolve_user)
+            self.resolver.forget(delta["removed"])
+            for key, user in self.resolver.drain():
+                engine.set_user(key, user, delta)
+
+        now = time.time()
+        with stats.phase("tasklist"):
+            self._apply_tasklist(delta, now)
+
+        with stats.phase("table"):
+            table = engine.table()
+        rows = table.rows()
+        with stats.phase("tree"):
+            tree = TreeIndex(table)
+
+        with stats.phase("system"):
+            system = self._system_metrics(now)
+
+        resolver_stats = self.resolver.stats_snapshot()
+        stats.gauge("processes", len(table))
+        stats.gauge("added", len(delta["added"]))
+        stats.gauge("removed", len(delta["removed"]))
+        stats.gauge("changed", len(delta["changed"]))
+        stats.gauge("cache_hits", resolver_stats["hits"])
+        stats.gauge("cache_misses", resolver_stats["misses"])
+        stats.gauge("resolver_pending", resolver_stats["pending"])
+        stats.gauge("resolver_avg_ms", round(resolver_stats["latency_avg"] * 1000.0, 3))
+        stats.gauge("resolver_max_ms", round(resolver_stats["latency_max"] * 1000.0, 3))
+        stats.gauge("interval", round(self.scheduler.interval, 3))
+        stats.end_tick()
+        self.scheduler.record(time.thread_time() - cpu0)
+
+        return {
+            "ts": now,
+            "version": delta["version"],
+            "table": table,
+            "rows": rows,
+            "tree": tree,
+            "delta": delta,
+            "system": system,
+        }
+
+
+class Snapshot:
+    __slots__ = ("version", "ts", "table", "rows", "tree", "delta", "system", "stats")
+
+    def __init__(
+        self,
+        version=0,
+        ts=0.0,
+        table=None,
+        rows=(),
+        tree=None,
+        delta=None,
+        system=None,
+        stats=None,
+    ):
+        self.version = version
+        self.ts = ts
+        self.table = table
+        self.rows = rows
+        self.tree = tree
+        self.delta = delta
+        self.system = system or {}
+        self.stats = stats or {}
+
+
+EMPTY_SNAPSHOT = Snapshot()
+
+
+def collect_snapshot(state, instrumentation=None):
+    collector = Collector(instrumentation)
+
+    while state.running:
+        t0 = time.time()
+        snapshot = collector.tick()
+        summary = collector.stats.summary()
+
+        with state.lock:
+            state.delta_log.append(snapshot["delta"])
+        state.snapshot = Snapshot(
+            snapshot["version"],
+            snapshot["ts"],
+            snapshot["table"],
+            snapshot["rows"],
+            snapshot["tree"],
+            snapshot["delta"],
+            snapshot["system"],
+            summary,
+        )
         with state.lock:
-            state.rows = rows
-            state.system = {
-                "cpu_percent": sys_cpu,
-                "mem_total_mb": mem_total_mb,
-                "mem_used_mb": mem_used_mb,
-                "mem_used_gb": mem_used_gb,
-                "mem_percent": mem_percent,
-                "disk_total_gb": disk_total_gb,
-                "disk_used_gb": disk_used_gb,
-                "disk_percent": disk_percent,
-                "net_down_bps": down_bps,
-                "net_up_bps": up_bps,
-                "system_drive": system_drive,
-                "uptime_seconds": max(0, int(now - boot_time)),
-            }
-            if state.selected_pid is None and state.rows:
-                state.selected_pid = state.rows[0]["pid"]
+            last_input = state.last_input
+            view_empty = state.view_empty
         state.ui_event.set()
 
+        interval = collector.scheduler.next_interval(last_input, view_empty)
         elapsed = time.time() - t0
-        timeout = max(0, SNAPSHOT_INTERVAL - elapsed)
+        timeout = max(0, interval - elapsed)
         if state.refresh_event.wait(timeout):
             state.refresh_event.clear()
             continue
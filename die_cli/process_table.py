@@ -0,0 +1,147 @@
+import heapq
+from array import array
+
+try:
+    import numpy
+except Exception:
+    numpy = None
+
+NUMERIC_COLUMNS = {
+    "pid": "q",
+    "ppid": "q",
+    "started": "d",
+    "cpu": "d",
+    "cpu_avg": "d",
+    "mem": "q",
+}
+STRING_COLUMNS = ("name", "user")
+SEARCH_COLUMNS = ("name_key", "user_key", "pid_key")
+_NUMPY_DTYPES = {"q": "int64", "d": "float64"}
+
+
+class ProcessTable:
+    def __init__(self, keys, columns):
+        self.keys = keys
+        self.columns = columns
+        self.size = len(keys)
+        self._numpy = {}
+
+    @classmethod
+    def from_records(cls, records):
+        columns = {}
+        for column, typecode in NUMERIC_COLUMNS.items():
+            columns[column] = array(typecode, [getattr(r, column) for r in records])
+        for column in (*STRING_COLUMNS, *SEARCH_COLUMNS):
+            columns[column] = [getattr(r, column) for r in records]
+        return cls([r.key for r in records], columns)
+
+    def __len__(self):
+        return self.size
+
+    def value(self, column, i):
+        if column == "key":
+            return self.keys[i]
+        return self.columns[column][i]
+
+    def numeric(self, column):
+        if numpy is None:
+            return self.columns[column]
+        values = self._numpy.get(column)
+        if values is None:
+            typecode = NUMERIC_COLUMNS[column]
+            values = numpy.frombuffer(self.columns[column], dtype=_NUMPY_DTYPES[typecode])
+            self._numpy[column] = values
+        return values
+
+    def argsort(self, column, reverse=False, order=None, head=None):
+        if order is None:
+            order = range(self.size)
+        if head is not None and head >= len(order):
+            head = None
+        if numpy is not None and column in NUMERIC_COLUMNS:
+            if isinstance(order, range):
+                index = numpy.arange(order.start, order.stop, order.step)
+            else:
+                index = numpy.asarray(order, dtype="int64")
+            values = self.numeric(column)[index]
+            if reverse:
+                values = -values
+            if head is None:
+                return index[numpy.argsort(values, kind="stable")].tolist()
+            picked = numpy.argpartition(values, head)
+            top = numpy.sort(picked[:head])
+            top = top[numpy.argsort(values[top], kind="stable")]
+            return index[top].tolist() + index[picked[head:]].tolist()
+        if column in STRING_COLUMNS:
+            column += "_key"
+        key = self.columns[column].__getitem__
+        if head is None:
+            return sorted(order, key=key, reverse=reverse)
+        top = (heapq.nlargest if reverse else heapq.nsmallest)(head, order, key=key)
+        chosen = set(top)
+        return top + [i for i in order if i not in chosen]
+
+    def rows(self, order=None):
+        if order is None:
+            order = range(self.size)
+        return TableRows(self, order)
+
+
+class RowView:
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, column):
+        try:
+            return self.table.value(column, self.index)
+        except KeyError:
+            raise KeyError(column) from None
+
+    def get(self, column, default=None):
+        try:
+            return self.table.value(column, self.index)
+        except KeyError:
+            return default
+
+    def to_dict(self, columns=None):
+        if columns is None:
+            columns = (*NUMERIC_COLUMNS, *STRING_COLUMNS)
+        return {column: self.table.value(column, self.index) for column in columns}
+
+
+class TableRows:
+    __slots__ = ("table", "order")
+
+    def __init__(self, table, order):
+        self.table = table
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __bool__(self):
+        return len(self.order) > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TableRows(self.table, self.order[i])
+        return RowView(self.table, self.order[i])
+
+    def __iter__(self):
+        table = self.table
+        for i in self.order:
+            yield RowView(table, i)
+
+    def pid_index(self):
+        pids = self.table.columns["pid"]
+        return {pids[i]: pos for pos, i in enumerate(self.order)}
+
+    def find(self, column, value):
+        values = self.table.columns[column]
+        for pos, i in enumerate(self.order):
+            if values[i] == value:
+                return pos
+        return -1
@@ -0,0 +1,76 @@
+from array import array
+
+
+class TreeIndex:
+    def __init__(self, table):
+        self.table = table
+        pids = table.columns["pid"]
+        ppids = table.columns["ppid"]
+        started = table.columns["started"]
+        size = len(table)
+        self.pid_index = {pid: i for i, pid in enumerate(pids)}
+        self.parent = array("q", [-1]) * size
+        self.children = {}
+        self.depth = array("l", [0]) * size
+        self.subtree_size = array("l", [1]) * size
+
+        index = self.pid_index
+        parent = self.parent
+        children = self.children
+        for i, ppid in enumerate(ppids):
+            p = index.get(ppid)
+            if p is None or p == i:
+                continue
+            if started[p] > started[i] or (
+                started[p] == started[i] and pids[p] >= pids[i]
+            ):
+                continue
+            parent[i] = p
+            kids = children.get(p)
+            if kids is None:
+                children[p] = [i]
+            else:
+                kids.append(i)
+
+        self.roots = [i for i, p in enumerate(parent) if p < 0]
+        self.preorder = preorder = []
+        depth = self.depth
+        stack = list(reversed(self.roots))
+        while stack:
+            i = stack.pop()
+            preorder.append(i)
+            kids = children.get(i)
+            if kids:
+                child_depth = depth[i] + 1
+                for child in kids:
+                    depth[child] = child_depth
+                stack.extend(reversed(kids))
+        subtree_size = self.subtree_size
+        for i in reversed(preorder):
+            p = parent[i]
+            if p >= 0:
+                subtree_size[p] += subtree_size[i]
+
+    def row_of(self, pid):
+        return self.pid_index.get(pid, -1)
+
+    def descendants(self, row):
+        out = []
+        stack = [(row, False)]
+        while stack:
+            i, expanded = stack.pop()
+            if expanded:
+                if i != row:
+                    out.append(i)
+                continue
+            stack.append((i, True))
+            for child in self.children.get(i, ()):
+                stack.append((child, False))
+        return out
+
+    def descendant_keys(self, pid):
+        row = self.row_of(pid)
+        if row < 0:
+            return ()
+        keys = self.table.keys
+        return tuple(keys[i] for i in self.descendants(row))
@@ -0,0 +1,63 @@
+import time
+
+COLLECT_BUDGET = 0.05
+MAX_INTERVAL = 5.0
+IDLE_AFTER = 60.0
+IDLE_INTERVAL = 3.0
+COST_SMOOTHING = 0.3
+REFRESH_TIERS = {
+    "users": 5.0,
+    "disk": 10.0,
+}
+
+
+class RefreshScheduler:
+    def __init__(
+        self,
+        interval,
+        budget=COLLECT_BUDGET,
+        max_interval=MAX_INTERVAL,
+        idle_after=IDLE_AFTER,
+        idle_interval=IDLE_INTERVAL,
+        tiers=None,
+        clock=time.monotonic,
+    ):
+        self.base_interval = interval
+        self.budget = budget
+        self.max_interval = max(interval, max_interval)
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.tiers = dict(REFRESH_TIERS if tiers is None else tiers)
+        self._clock = clock
+        self._last_run = {}
+        self.cost = 0.0
+        self.interval = interval
+        self.idle = False
+
+    def due(self, tier):
+        now = self._clock()
+        last = self._last_run.get(tier)
+        if last is not None and (now - last) < self.tiers.get(tier, 0.0):
+            return False
+        self._last_run[tier] = now
+        return True
+
+    def record(self, cost):
+        if self.cost:
+            self.cost += COST_SMOOTHING * (cost - self.cost)
+        else:
+            self.cost = cost
+
+    def next_interval(self, last_input=None, view_empty=False):
+        interval = self.base_interval
+        if self.budget > 0:
+            interval = max(interval, self.cost / self.budget)
+        interval = min(interval, self.max_interval)
+        idle = view_empty
+        if last_input is not None and self.idle_after > 0:
+            idle = idle or (self._clock() - last_input) >= self.idle_after
+        if idle:
+            interval = max(interval, self.idle_interval)
+        self.idle = idle
+        self.interval = interval
+        return interval
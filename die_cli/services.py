@@ -0,0 +1,65 @@
+import time
+
+import psutil
+
+SERVICE_REFRESH = 30.0
+SERVICE_MIN_REFRESH = 2.0
+SERVICE_HOST_NAMES = {"svchost.exe", "dllhost.exe", "wmiprvse.exe"}
+
+
+def build_service_user_map():
+    mapping = {}
+    try:
+        for svc in psutil.win_service_iter():
+            try:
+                info = svc.as_dict()
+                pid = info.get("pid")
+                user = info.get("username")
+                if pid and user:
+                    mapping[pid] = user
+            except Exception:
+                continue
+    except Exception:
+        pass
+    return mapping
+
+
+class ServiceUserMap:
+    def __init__(
+        self,
+        provider=build_service_user_map,
+        interval=SERVICE_REFRESH,
+        min_interval=SERVICE_MIN_REFRESH,
+        clock=time.monotonic,
+    ):
+        self._provider = provider
+        self._interval = interval
+        self._min_interval = min_interval
+        self._clock = clock
+        self.mapping = {}
+        self.last_refresh = None
+        self.refreshes = 0
+        self.stale = True
+
+    def lookup(self, pid, name=None):
+        user = self.mapping.get(pid)
+        if user is None and name and name.lower() in SERVICE_HOST_NAMES:
+            self.stale = True
+        return user
+
+    def refresh_if_due(self):
+        now = self._clock()
+        if self.last_refresh is not None:
+            age = now - self.last_refresh
+            if age < self._interval and not (self.stale and age >= self._min_interval):
+                return False
+        try:
+            mapping = self._provider()
+        except Exception:
+            mapping = None
+        if mapping is not None:
+            self.mapping = mapping
+        self.last_refresh = now
+        self.refreshes += 1
+        self.stale = False
+        return True
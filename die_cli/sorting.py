@@ -0,0 +1,55 @@
+import os
+
+SORT_COLUMNS = ("cpu", "mem", "pid", "name", "user")
+DESCENDING = frozenset(("cpu", "mem"))
+DEFAULT_SORT = ("cpu", True)
+FULL_SORT_FRACTION = 0.25
+SMOOTH_ENV = "DIE_CLI_SMOOTH_CPU"
+SMOOTH_COLUMNS = {"cpu": "cpu_avg"}
+SMOOTH_MARGIN = 2.0
+
+
+def smoothing_enabled():
+    return os.environ.get(SMOOTH_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def next_sort(column):
+    i = SORT_COLUMNS.index(column) if column in SORT_COLUMNS else -1
+    column = SORT_COLUMNS[(i + 1) % len(SORT_COLUMNS)]
+    return column, column in DESCENDING
+
+
+def sort_rows(rows, column, reverse, head=None):
+    if not rows:
+        return rows, 0
+    size = len(rows)
+    if head is None or head >= size * FULL_SORT_FRACTION:
+        head = size
+    table = rows.table
+    order = table.argsort(column, reverse, rows.order, head if head < size else None)
+    return table.rows(order), head
+
+
+def stabilize(rows, ordered, column, reverse, ranks, margin=SMOOTH_MARGIN):
+    if not rows:
+        return rows, {}
+    table = rows.table
+    keys = table.keys
+    values = table.columns[column]
+    order = rows.order
+    head = order[:ordered]
+    placed = sorted(range(len(head)), key=lambda pos: ranks.get(keys[head[pos]], pos))
+    head = [head[pos] for pos in placed]
+
+    sign = 1.0 if reverse else -1.0
+    for i in range(1, len(head)):
+        item = head[i]
+        value = values[item] * sign - margin
+        j = i
+        while j > 0 and value > values[head[j - 1]] * sign:
+            head[j] = head[j - 1]
+            j -= 1
+        head[j] = item
+
+    ranks = {keys[i]: pos for pos, i in enumerate(head)}
+    return table.rows(head + order[ordered:]), ranks
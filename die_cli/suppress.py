@@ -0,0 +1,171 @@
+import os
+import time
+from collections import deque
+
+import psutil
+
+from .kill_engine import _is_gone, kill_wave
+from .process_identity import CREATE_TIME_TOLERANCE, ppid_map
+from .scheduler import RefreshScheduler
+
+SCAN_INTERVAL = 0.02
+SCAN_BUDGET = 0.25
+MAX_SCAN_INTERVAL = 0.5
+STATUS_INTERVAL = 0.25
+QUIET_PERIOD = 2.0
+QUIET_ENV = "DIE_CLI_SUPPRESS_QUIET"
+MAX_DURATION = 120.0
+FREEZE_PASSES = 4
+KILL_GRACE = 0.2
+RATE_WINDOW = 1.0
+
+
+def quiet_period():
+    try:
+        return max(0.0, float(os.environ.get(QUIET_ENV, QUIET_PERIOD)))
+    except ValueError:
+        return QUIET_PERIOD
+
+
+class Suppressor:
+    def __init__(self, root_key, my_pid, quiet=QUIET_PERIOD, max_duration=MAX_DURATION):
+        self.tracked = {root_key[0]: root_key[1]}
+        self.my_pid = my_pid
+        self.quiet = quiet
+        self.max_duration = max_duration
+        self.waves = 0
+        self.killed = 0
+        self.seen = 1
+        self.peak_rate = 0.0
+        self.started = time.monotonic()
+        self.last_seen = self.started
+        self._spawns = deque()
+        self._primed = False
+        self.scheduler = RefreshScheduler(
+            SCAN_INTERVAL,
+            budget=SCAN_BUDGET,
+            max_interval=MAX_SCAN_INTERVAL,
+            idle_after=0,
+            tiers={},
+        )
+
+    def _adopt(self, pid, ppid, ppids):
+        if pid == self.my_pid:
+            return None
+        try:
+            proc = psutil.Process(pid)
+            started = proc.create_time()
+        except Exception:
+            return None
+        parent_started = self.tracked[ppid]
+        if started + CREATE_TIME_TOLERANCE < parent_started:
+            return None
+        if ppid in ppids:
+            try:
+                if abs(psutil.Process(ppid).create_time() - parent_started) > CREATE_TIME_TOLERANCE:
+                    return None
+            except psutil.NoSuchProcess:
+                pass
+            except Exception:
+                return None
+        self.tracked[pid] = started
+        return proc
+
+    def _family(self, now):
+        ppids = ppid_map()
+        children = {}
+        for pid, ppid in ppids.items():
+            if ppid != pid:
+                children.setdefault(ppid, []).append(pid)
+
+        targets = []
+        spawned = 0
+        stack = list(self.tracked)
+        visited = set()
+        while stack:
+            pid = stack.pop()
+            if pid in visited:
+                continue
+            visited.add(pid)
+            for child in children.get(pid, ()):
+                if child in self.tracked:
+                    stack.append(child)
+                elif self._adopt(child, pid, ppids) is not None:
+                    spawned += 1
+                    stack.append(child)
+
+        for pid in visited:
+            if pid not in ppids:
+                continue
+            try:
+                proc = psutil.Process(pid)
+                if abs(proc.create_time() - self.tracked[pid]) > CREATE_TIME_TOLERANCE:
+                    continue
+            except Exception:
+                continue
+            if not _is_gone(proc):
+                targets.append(proc)
+
+        self.seen += spawned
+        if not self._primed:
+            self._primed = True
+            return targets
+        self._spawns.append((now, spawned))
+        while self._spawns and now - self._spawns[0][0] > RATE_WINDOW:
+            self._spawns.popleft()
+        window = max(SCAN_INTERVAL, min(RATE_WINDOW, now - self.started))
+        rate = sum(count for _, count in self._spawns) / window
+        if rate > self.peak_rate:
+            self.peak_rate = rate
+        return targets
+
+    def _freeze(self, targets):
+        frozen = {proc.pid for proc in targets}
+        for _ in range(FREEZE_PASSES):
+            for proc in targets:
+                try:
+                    proc.suspend()
+                except Exception:
+                    pass
+            fresh = [proc for proc in self._family(time.monotonic()) if proc.pid not in frozen]
+            if not fresh:
+                break
+            frozen.update(proc.pid for proc in fresh)
+            targets.extend(fresh)
+        return targets
+
+    def step(self):
+        cpu0 = time.thread_time()
+        now = time.monotonic()
+        targets = self._family(now)
+        if targets:
+            self.waves += 1
+            targets = self._freeze(targets)
+            wave = kill_wave(targets, 0.0, KILL_GRACE)
+            self.killed += wave.terminated + wave.killed
+            for proc in wave.survivors:
+                try:
+                    proc.resume()
+                except Exception:
+                    pass
+            self.last_seen = time.monotonic()
+        self.scheduler.record(time.thread_time() - cpu0)
+        return targets
+
+    def next_interval(self):
+        return self.scheduler.next_interval()
+
+    def quiet_for(self):
+        return time.monotonic() - self.last_seen
+
+    def finished(self):
+        return self.quiet_for() >= self.quiet
+
+    def timed_out(self):
+        return time.monotonic() - self.started >= self.max_duration
+
+    def summary(self):
+        return (
+            f"{self.waves} waves, {self.killed} killed, "
+            f"peak {self.peak_rate:.0f} spawn/s"
+        )
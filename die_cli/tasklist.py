@@ -0,0 +1,100 @@
+import csv
+import os
+import subprocess
+import threading
+import time
+
+TASKLIST_CMD = ["tasklist", "/V", "/FO", "CSV"]
+TASKLIST_TIMEOUT = 10.0
+TASKLIST_BATCH = 64
+_NO_USER = {"N/A", "N/D"}
+
+
+def parse_tasklist_rows(lines):
+    reader = csv.reader(lines)
+    next(reader, None)
+    for row in reader:
+        if len(row) < 7:
+            continue
+        try:
+            pid = int(row[1])
+        except Exception:
+            continue
+        user = (row[6] or "").strip()
+        if not pid or not user or user.upper() in _NO_USER:
+            continue
+        yield pid, user
+
+
+class TasklistJob:
+    def __init__(self, cmd=None, timeout=TASKLIST_TIMEOUT):
+        if cmd is None and os.name == "nt":
+            cmd = TASKLIST_CMD
+        self._cmd = cmd
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._results = {}
+        self._thread = None
+        self.runs = 0
+        self.last_duration = 0.0
+
+    @property
+    def enabled(self):
+        return bool(self._cmd)
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.enabled or self.running():
+            return False
+        self._thread = threading.Thread(
+            target=self._run, name="die-tasklist", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def drain(self):
+        with self._lock:
+            results, self._results = self._results, {}
+        return results
+
+    def _merge(self, batch):
+        with self._lock:
+            self._results.update(batch)
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            proc = subprocess.Popen(
+                self._cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                text=True,
+            )
+        except Exception:
+            return
+        timer = threading.Timer(self._timeout, proc.kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            batch = {}
+            for pid, user in parse_tasklist_rows(proc.stdout):
+                batch[pid] = user
+                if len(batch) >= TASKLIST_BATCH:
+                    self._merge(batch)
+                    batch = {}
+            if batch:
+                self._merge(batch)
+        except Exception:
+            pass
+        finally:
+            timer.cancel()
+            try:
+                proc.stdout.close()
+                proc.wait(timeout=1)
+            except Exception:
+                pass
+            self.runs += 1
+            self.last_duration = time.perf_counter() - t0
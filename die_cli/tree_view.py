@@ -0,0 +1,275 @@
+DELTA_HISTORY = 16
+REBUILD_EVERY = 600
+
+
+class _Node:
+    __slots__ = (
+        "key",
+        "ppid",
+        "parent",
+        "children",
+        "name",
+        "user",
+        "cpu",
+        "mem",
+        "sub_cpu",
+        "sub_mem",
+    )
+
+    def __init__(self, key):
+        self.key = key
+        self.ppid = 0
+        self.parent = None
+        self.children = set()
+        self.name = ""
+        self.user = ""
+        self.cpu = 0.0
+        self.mem = 0
+        self.sub_cpu = 0.0
+        self.sub_mem = 0
+
+
+def _older(parent_key, key):
+    return (parent_key[1], parent_key[0]) < (key[1], key[0])
+
+
+class TreeAggregates:
+    def __init__(self):
+        self.nodes = {}
+        self.by_pid = {}
+        self.roots = set()
+        self.version = None
+        self.generation = 0
+        self._synced = 0
+
+    def update(self, table, tree, version, delta_log):
+        if version is None or version == self.version:
+            return
+        deltas = [d for d in delta_log if d["version"] > (self.version or 0)]
+        if (
+            self.version is None
+            or self._synced >= REBUILD_EVERY
+            or not deltas
+            or deltas[0]["version"] != self.version + 1
+        ):
+            self._rebuild(table, tree)
+        else:
+            touched = set()
+            for delta in deltas:
+                touched.update(delta["added"])
+                touched.update(delta["removed"])
+                touched.update(delta["changed"])
+            self._sync(table, tree, touched)
+            self._synced += 1
+        self.version = version
+        self.generation += 1
+
+    def _rebuild(self, table, tree):
+        self.nodes = {}
+        self.by_pid = {}
+        self.roots = set()
+        self._synced = 0
+        self._sync(table, tree, table.keys)
+
+    def _row(self, table, tree, key):
+        row = tree.pid_index.get(key[0], -1)
+        if row >= 0 and table.keys[row] == key:
+            return row
+        return -1
+
+    def _propagate(self, node, cpu, mem):
+        while node is not None:
+            node.sub_cpu += cpu
+            node.sub_mem += mem
+            node = node.parent
+
+    def _detach(self, node):
+        parent = node.parent
+        if parent is None:
+            self.roots.discard(node)
+            return
+        parent.children.discard(node)
+        self._propagate(parent, -node.sub_cpu, -node.sub_mem)
+        node.parent = None
+
+    def _attach(self, node):
+        parent_key = self.by_pid.get(node.ppid)
+        parent = self.nodes.get(parent_key) if parent_key else None
+        if parent is None or parent is node or not _older(parent_key, node.key):
+            self.roots.add(node)
+            return
+        node.parent = parent
+        parent.children.add(node)
+        self._propagate(parent, node.sub_cpu, node.sub_mem)
+
+    def _sync(self, table, tree, keys):
+        columns = table.columns
+        nodes = self.nodes
+        relink = []
+
+        for key in keys:
+            node = nodes.get(key)
+            row = self._row(table, tree, key)
+            if node is None:
+                if row < 0:
+                    continue
+                node = _Node(key)
+                nodes[key] = node
+                self.by_pid[key[0]] = key
+                node.ppid = columns["ppid"][row]
+                relink.append(node)
+            elif row < 0:
+                self._detach(node)
+                for child in node.children:
+                    child.parent = None
+                    relink.append(child)
+                node.children = set()
+                del nodes[key]
+                if self.by_pid.get(key[0]) == key:
+                    del self.by_pid[key[0]]
+                continue
+            elif columns["ppid"][row] != node.ppid:
+                self._detach(node)
+                node.ppid = columns["ppid"][row]
+                relink.append(node)
+
+            node.name = columns["name"][row]
+            node.user = columns["user"][row]
+            cpu = columns["cpu"][row]
+            mem = columns["mem"][row]
+            if cpu != node.cpu or mem != node.mem:
+                self._propagate(node, cpu - node.cpu, mem - node.mem)
+                node.cpu = cpu
+                node.mem = mem
+
+        for node in relink:
+            if node.key in nodes and node.parent is None:
+                self.roots.discard(node)
+                self._attach(node)
+
+
+def _subtree_cpu(node):
+    return node.sub_cpu
+
+
+class TreeRows:
+    __slots__ = ("entries", "expanded")
+
+    def __init__(self, entries, expanded):
+        self.entries = entries
+        self.expanded = expanded
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def _row(self, entry):
+        node, depth = entry
+        if not node.children:
+            marker = "  "
+        elif node.key in self.expanded:
+            marker = "- "
+        else:
+            marker = "+ "
+        label = "  " * depth + marker + node.name
+        if node.children:
+            label += f" [{len(node.children)}]"
+        return {
+            "key": node.key,
+            "pid": node.key[0],
+            "name": node.name,
+            "user": node.user,
+            "cpu": max(0.0, node.sub_cpu),
+            "mem": max(0, node.sub_mem),
+            "depth": depth,
+            "label": label,
+            "parent_pid": node.parent.key[0] if node.parent is not None else None,
+            "has_children": bool(node.children),
+        }
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(entry) for entry in self.entries[i]]
+        return self._row(self.entries[i])
+
+    def __iter__(self):
+        for entry in self.entries:
+            yield self._row(entry)
+
+    def pid_index(self):
+        return {node.key[0]: pos for pos, (node, _) in enumerate(self.entries)}
+
+    def find(self, column, value):
+        if column != "pid":
+            raise KeyError(column)
+        for pos, (node, _) in enumerate(self.entries):
+            if node.key[0] == value:
+                return pos
+        return -1
+
+
+class TreeView:
+    def __init__(self):
+        self.aggregates = TreeAggregates()
+        self.expanded = set()
+        self._expanded_gen = 0
+        self._cache_key = None
+        self._rows = TreeRows([], self.expanded)
+
+    def toggle(self, key, expand=None):
+        if expand is None:
+            expand = key not in self.expanded
+        if expand and key not in self.expanded:
+            self.expanded.add(key)
+        elif not expand and key in self.expanded:
+            self.expanded.discard(key)
+        else:
+            return False
+        self._expanded_gen += 1
+        return True
+
+    def rows(self, table, tree, version, delta_log, filter_text, matches=None):
+        if table is None or tree is None:
+            return TreeRows([], self.expanded)
+        self.aggregates.update(table, tree, version, delta_log)
+        cache_key = (self.aggregates.generation, self._expanded_gen, filter_text)
+        if cache_key != self._cache_key:
+            forced = self._forced(matches()) if filter_text and matches is not None else None
+            self._rows = TreeRows(self._flatten(forced), self.expanded)
+            self._cache_key = cache_key
+        return self._rows
+
+    def _forced(self, matches):
+        nodes = self.aggregates.nodes
+        forced = set()
+        for key in matches:
+            node = nodes.get(key)
+            while node is not None and node not in forced:
+                forced.add(node)
+                node = node.parent
+        return forced
+
+    def _flatten(self, forced):
+        expanded = self.expanded
+        roots = self.aggregates.roots
+        if forced is not None:
+            roots = [node for node in roots if node in forced]
+        entries = []
+        stack = [(node, 0) for node in sorted(roots, key=_subtree_cpu)]
+        while stack:
+            node, depth = stack.pop()
+            entries.append((node, depth))
+            if not node.children:
+                continue
+            if forced is not None:
+                children = [child for child in node.children if child in forced]
+                if node.key in expanded:
+                    children = node.children
+            elif node.key in expanded:
+                children = node.children
+            else:
+                continue
+            stack.extend((child, depth + 1) for child in sorted(children, key=_subtree_cpu))
+        return entries
@@ -1,12 +1,25 @@
 import curses
 import ctypes
-import msvcrt
 import os
 import sys
 import threading
 import time
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import msvcrt
+except Exception:
+    msvcrt = None
+
+try:
+    import select
+    import termios
+    import tty
+except Exception:
+    termios = None
+
 from rich import box
 from rich.align import Align
 from rich.console import Console, Group
@@ -17,8 +30,21 @@ from rich.table import Table
 from rich.text import Text
 
 from . import beeps
-from .actions import action_worker
-from .process_snapshot import collect_snapshot
+from .actions import ActionQueue, queue_bulk_kill, start_action_workers
+from .filters import FilterEngine, FilterError, compile_query
+from .fuzzy import FUZZY_PREFIX, FuzzyIndex
+from .instrumentation import PHASES, Instrumentation, RedrawStats
+from .process_snapshot import EMPTY_SNAPSHOT, collect_snapshot
+from .scheduler import IDLE_AFTER
+from .sorting import (
+    DEFAULT_SORT,
+    SMOOTH_COLUMNS,
+    next_sort,
+    smoothing_enabled,
+    sort_rows,
+    stabilize,
+)
+from .tree_view import DELTA_HISTORY, TreeRows, TreeView
 
 REFRESH_UI_HZ = 30
 POLL_INTERVAL_WT = 0.05
@@ -36,6 +62,11 @@ LOGO_SKULL = []
 LOGO_HEIGHT = len(LOGO_DIE_BASE)
 SKULL_STYLE = "grey35"
 SKULL_FILE = "skull ascii.txt"
+STATS_OVERLAY_HEIGHT = len(PHASES) + 4
+ESC_SEQUENCE_TIMEOUT = 0.02
+POSIX_ARROWS = {"A": "UP", "B": "DOWN", "C": "RIGHT", "D": "LEFT"}
+POSIX_KEYS = {"\r": "ENTER", "\n": "ENTER", "\x7f": "BACKSPACE", "\x08": "CTRL_BACKSPACE"}
+_PENDING_KEYS = deque()
 
 
 def _load_skull_lines():
@@ -64,7 +95,9 @@ def _get_skull_lines():
 class SharedState:
     def __init__(self):
         self.lock = threading.Lock()
-        self.rows = []
+        self.snapshot = EMPTY_SNAPSHOT
+        self.view_cache = ViewCache()
+        self.delta_log = deque(maxlen=DELTA_HISTORY)
         self.status = "READY"
         self.filter_text = ""
         self.filter_mode = False
@@ -72,17 +105,30 @@ class SharedState:
         self.selected_idx = 0
         self.selected_pid = None
         self.scroll = 0
-        self.action_queue = []
+        self.action_queue = ActionQueue()
+        self.action_workers = 1
+        self.marked = set()
         self.beep_queue = []
         self.running = True
         self.refresh_event = threading.Event()
         self.ui_event = threading.Event()
-        self.system = {}
+        self.last_input = time.monotonic()
+        self.view_empty = False
+        self.show_stats = False
+        self.tree_mode = False
+        self.tree_view = TreeView()
+        self.sort = DEFAULT_SORT
+        self.smooth = smoothing_enabled()
+        self.redraw = RedrawStats()
 
 
 def _queue_action(state, job):
+    if state.action_queue.put(job):
+        return True
     with state.lock:
-        state.action_queue.append(job)
+        state.status = f"ALREADY QUEUED {job['pid']} {job.get('name', '?')}"
+    state.ui_event.set()
+    return False
 
 
 def _queue_beep(state, pattern):
@@ -90,42 +136,133 @@ def _queue_beep(state, pattern):
         state.beep_queue.append(pattern)
 
 
-def _apply_filter(rows, filter_text):
-    if not filter_text:
+def _apply_filter(rows, filter_text, engine=None):
+    if not filter_text or not rows:
         return rows
-    needle = filter_text.lower()
-    filtered = []
-    for row in rows:
-        name = str(row.get("name", "")).lower()
-        user = str(row.get("user", "")).lower()
-        pid = str(row.get("pid", ""))
-        if needle in name or needle in user or needle in pid:
-            filtered.append(row)
-    return filtered
+    return (engine or FilterEngine()).apply(rows, filter_text)
+
+
+class ViewCache:
+    def __init__(self):
+        self.key = None
+        self.rows = ()
+        self.sorted = 0
+        self.error = None
+        self.engine = FilterEngine()
+        self.fuzzy = FuzzyIndex()
+        self._base_key = None
+        self._base = ()
+        self._ranks = (None, {})
+        self.matched = 0
+        self._index = None
+
+    def _filter(self, snapshot, filter_text, delta_log):
+        if filter_text.startswith(FUZZY_PREFIX):
+            rows = self.fuzzy.rows(snapshot, filter_text[len(FUZZY_PREFIX) :], delta_log or ())
+            self.matched = self.fuzzy.matched
+            return rows
+        return _apply_filter(snapshot.rows, filter_text, self.engine)
+
+    def rows_for(self, snapshot, filter_text, tree_view=None, delta_log=None, sort=None, head=None):
+        fuzzy = filter_text.startswith(FUZZY_PREFIX)
+        try:
+            if tree_view is not None:
+                matches = None
+                if filter_text:
+                    if not fuzzy:
+                        compile_query(filter_text)
+
+                    def matches():
+                        matched = self._filter(snapshot, filter_text, delta_log)
+                        return [matched.table.keys[i] for i in matched.order]
+
+                rows = tree_view.rows(
+                    snapshot.table,
+                    snapshot.tree,
+                    snapshot.version,
+                    delta_log,
+                    filter_text,
+                    matches,
+                )
+                key = ("tree", rows)
+                ordered = len(rows)
+            else:
+                if fuzzy:
+                    self.fuzzy.update(snapshot, delta_log or ())
+                    sort = None
+                base_key = (snapshot.version, filter_text, self.fuzzy.generation if fuzzy else None)
+                if base_key != self._base_key:
+                    self._base = self._filter(snapshot, filter_text, delta_log)
+                    self._base_key = base_key
+                key = (base_key, sort)
+                rows = self._base
+                ordered = len(rows)
+                if sort is not None:
+                    if key == self.key and self.sorted >= min(head or ordered, ordered):
+                        rows = self.rows
+                        ordered = self.sorted
+                    else:
+                        rows, ordered = sort_rows(rows, sort[0], sort[1], head)
+                        if sort[0] in SMOOTH_COLUMNS.values():
+                            ranks = self._ranks[1] if self._ranks[0] == sort else {}
+                            rows, ranks = stabilize(rows, ordered, sort[0], sort[1], ranks)
+                            self._ranks = (sort, ranks)
+        except FilterError as e:
+            self.error = str(e)
+            return self.rows
+        self.error = None
+        self.key = key
+        self.sorted = ordered
+        if rows is not self.rows:
+            self.rows = rows
+            self._index = None
+        return rows
+
+    def index_of(self, pid):
+        if self._index is None:
+            self._index = self.rows.pid_index() if self.rows else {}
+        return self._index.get(pid, -1)
 
 
 def _build_view(state, max_rows):
+    snapshot = state.snapshot
     with state.lock:
-        rows = list(state.rows)
+        tree_mode = state.tree_mode
+        active_filter = state.filter_input if state.filter_mode else state.filter_text
+        if tree_mode or active_filter.startswith(FUZZY_PREFIX):
+            delta_log = list(state.delta_log)
+        else:
+            delta_log = None
         status = state.status
         filter_text = state.filter_text
         filter_mode = state.filter_mode
         filter_input = state.filter_input
         selected_pid = state.selected_pid
         scroll = state.scroll
-        system = dict(state.system)
-
-    rows = _apply_filter(rows, filter_text)
+        stats = snapshot.stats if state.show_stats else None
+        marked = state.marked
+        sort = state.sort
+        smooth = state.smooth
+    order_by = sort
+    if smooth and sort[0] in SMOOTH_COLUMNS:
+        order_by = (SMOOTH_COLUMNS[sort[0]], sort[1])
+
+    cache = state.view_cache
+    if tree_mode:
+        rows = cache.rows_for(snapshot, active_filter, state.tree_view, delta_log)
+    else:
+        head = scroll + 2 * max_rows
+        rows = cache.rows_for(snapshot, active_filter, delta_log=delta_log, sort=order_by, head=head)
     selected_idx = 0
 
     if rows:
         if selected_pid is None:
             selected_pid = rows[0]["pid"]
-        for i, row in enumerate(rows):
-            if row["pid"] == selected_pid:
-                selected_idx = i
-                break
-        else:
+        selected_idx = cache.index_of(selected_pid)
+        if selected_idx >= cache.sorted:
+            rows = cache.rows_for(snapshot, active_filter, delta_log=delta_log, sort=order_by)
+            selected_idx = cache.index_of(selected_pid)
+        if selected_idx < 0:
             selected_pid = rows[0]["pid"]
             selected_idx = 0
     else:
@@ -147,6 +284,7 @@ def _build_view(state, max_rows):
         state.selected_pid = selected_pid
         state.selected_idx = selected_idx
         state.scroll = scroll
+        state.view_empty = bool(active_filter) and not rows
 
     return {
         "rows": rows,
@@ -155,9 +293,18 @@ def _build_view(state, max_rows):
         "filter_text": filter_text,
         "filter_mode": filter_mode,
         "filter_input": filter_input,
+        "filter_error": cache.error,
+        "matched": cache.matched if active_filter.startswith(FUZZY_PREFIX) and not tree_mode else 0,
         "selected_idx": selected_idx,
         "scroll": scroll,
-        "system": system,
+        "system": snapshot.system,
+        "stats": stats,
+        "redraw": state.redraw.summary() if stats is not None else None,
+        "tree_mode": tree_mode,
+        "jobs": state.action_queue.depth(),
+        "marked": marked,
+        "sort": None if tree_mode or active_filter.startswith(FUZZY_PREFIX) else sort,
+        "smooth": smooth and not tree_mode,
     }
 
 
@@ -244,7 +391,65 @@ def _logo_text():
     return text
 
 
+def _stdin_ready(timeout=0.0):
+    try:
+        return bool(select.select([sys.stdin], [], [], timeout)[0])
+    except Exception:
+        return False
+
+
+def _fill_pending(timeout=0.0):
+    if not _stdin_ready(timeout):
+        return False
+    try:
+        data = os.read(sys.stdin.fileno(), 64)
+    except Exception:
+        return False
+    _PENDING_KEYS.extend(data.decode("utf-8", "replace"))
+    return bool(data)
+
+
+def _read_key_posix():
+    if not _PENDING_KEYS and not _fill_pending():
+        return None
+    ch = _PENDING_KEYS.popleft()
+    if ch != "\x1b":
+        return POSIX_KEYS.get(ch, ch)
+    if not _PENDING_KEYS:
+        _fill_pending(ESC_SEQUENCE_TIMEOUT)
+    if not _PENDING_KEYS or _PENDING_KEYS[0] not in ("[", "O"):
+        return "ESC"
+    intro = _PENDING_KEYS.popleft()
+    params = ""
+    while True:
+        if not _PENDING_KEYS and not _fill_pending(ESC_SEQUENCE_TIMEOUT):
+            return None
+        final = _PENDING_KEYS.popleft()
+        if intro == "O" or "\x40" <= final <= "\x7e":
+            break
+        params += final
+    if params:
+        return None
+    return POSIX_ARROWS.get(final)
+
+
+@contextmanager
+def _terminal_input():
+    if msvcrt is not None or termios is None or not sys.stdin.isatty():
+        yield
+        return
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
 def _read_key():
+    if msvcrt is None:
+        return _read_key_posix() if termios is not None else None
     if not msvcrt.kbhit():
         return None
     ch = msvcrt.getwch()
@@ -254,6 +459,10 @@ def _read_key():
             return "UP"
         if ch2 == "P":
             return "DOWN"
+        if ch2 == "K":
+            return "LEFT"
+        if ch2 == "M":
+            return "RIGHT"
         return None
     if ch == "\r":
         return "ENTER"
@@ -266,6 +475,14 @@ def _read_key():
     return ch
 
 
+def _note_input(state):
+    with state.lock:
+        was_idle = time.monotonic() - state.last_input >= IDLE_AFTER
+        state.last_input = time.monotonic()
+    if was_idle:
+        state.refresh_event.set()
+
+
 def _handle_filter_input(key, state):
     if key == "ESC":
         with state.lock:
@@ -276,6 +493,13 @@ def _handle_filter_input(key, state):
         return
 
     if key == "ENTER":
+        try:
+            compile_query(state.filter_input)
+        except FilterError as e:
+            with state.lock:
+                state.status = f"FILTER ERROR: {e}"
+            state.ui_event.set()
+            return
         with state.lock:
             state.filter_text = state.filter_input
             state.filter_mode = False
@@ -326,14 +550,59 @@ def _handle_normal_input(key, state, rows, selected_idx):
         state.ui_event.set()
         return
 
+    if key == " " and rows:
+        row = rows[selected_idx]
+        with state.lock:
+            if row["key"] in state.marked:
+                state.marked.discard(row["key"])
+            else:
+                state.marked.add(row["key"])
+            new_idx = min(len(rows) - 1, selected_idx + 1)
+            state.selected_idx = new_idx
+            state.selected_pid = rows[new_idx]["pid"]
+            state.status = f"MARKED {len(state.marked)}"
+        state.ui_event.set()
+        return
+
+    if key in ("a", "A"):
+        if not state.filter_text.strip(FUZZY_PREFIX + " ") or state.tree_mode:
+            with state.lock:
+                state.status = "MARK ALL NEEDS A FILTER (LIST VIEW)"
+            state.ui_event.set()
+            return
+        keys = [row["key"] for row in rows]
+        if keys:
+            with state.lock:
+                state.marked.update(keys)
+                state.status = f"MARKED {len(state.marked)}"
+            state.ui_event.set()
+        return
+
+    if key in ("u", "U"):
+        with state.lock:
+            state.marked = set()
+            state.status = "MARKS CLEARED"
+        state.ui_event.set()
+        return
+
+    if key in ("k", "K") and state.marked:
+        with state.lock:
+            members = sorted(state.marked)
+            state.marked = set()
+        if queue_bulk_kill(state, members, state.action_workers):
+            _queue_beep(state, "long")
+        state.ui_event.set()
+        return
+
     if key in ("k", "K") and rows:
         row = rows[selected_idx]
         with state.lock:
             state.status = f"KILLING {row['pid']} {row['name']}"
-        _queue_action(
-            state, {"kind": "KILL", "pid": row["pid"], "name": row["name"]}
-        )
-        _queue_beep(state, "short3")
+        if _queue_action(
+            state,
+            {"kind": "KILL", "pid": row["pid"], "key": row["key"], "name": row["name"]},
+        ):
+            _queue_beep(state, "short3")
         state.ui_event.set()
         return
 
@@ -341,10 +610,82 @@ def _handle_normal_input(key, state, rows, selected_idx):
         row = rows[selected_idx]
         with state.lock:
             state.status = f"KILLING TREE {row['pid']} {row['name']}"
-        _queue_action(
-            state, {"kind": "KILL_TREE", "pid": row["pid"], "name": row["name"]}
-        )
-        _queue_beep(state, "long")
+        tree = state.snapshot.tree
+        if _queue_action(
+            state,
+            {
+                "kind": "KILL_TREE",
+                "pid": row["pid"],
+                "key": row["key"],
+                "name": row["name"],
+                "members": tree.descendant_keys(row["pid"]) if tree is not None else None,
+            },
+        ):
+            _queue_beep(state, "long")
+        state.ui_event.set()
+        return
+
+    if key in ("x", "X") and rows:
+        row = rows[selected_idx]
+        with state.lock:
+            state.status = f"SUPPRESSING {row['pid']} {row['name']}"
+        tree = state.snapshot.tree
+        if _queue_action(
+            state,
+            {
+                "kind": "SUPPRESS",
+                "pid": row["pid"],
+                "key": row["key"],
+                "name": row["name"],
+                "members": tree.descendant_keys(row["pid"]) if tree is not None else None,
+            },
+        ):
+            _queue_beep(state, "long")
+        state.ui_event.set()
+        return
+
+    if key in ("v", "V"):
+        with state.lock:
+            state.tree_mode = not state.tree_mode
+            state.status = "TREE VIEW" if state.tree_mode else "LIST VIEW"
+        state.ui_event.set()
+        return
+
+    if key in ("RIGHT", "+", "LEFT", "-") and rows and isinstance(rows, TreeRows):
+        row = rows[selected_idx]
+        if key in ("RIGHT", "+"):
+            state.tree_view.toggle(row["key"], True)
+        elif not state.tree_view.toggle(row["key"], False) and row["parent_pid"] is not None:
+            with state.lock:
+                state.selected_pid = row["parent_pid"]
+        state.ui_event.set()
+        return
+
+    if key in ("d", "D"):
+        with state.lock:
+            state.show_stats = not state.show_stats
+            state.status = "STATS ON" if state.show_stats else "STATS OFF"
+        state.ui_event.set()
+        return
+
+    if key in ("s", "S", "i", "I"):
+        with state.lock:
+            column, reverse = state.sort
+            if key in ("s", "S"):
+                column, reverse = next_sort(column)
+            else:
+                reverse = not reverse
+            state.sort = (column, reverse)
+            state.selected_pid = None
+            state.scroll = 0
+            state.status = f"SORT {column.upper()} {'DESC' if reverse else 'ASC'}"
+        state.ui_event.set()
+        return
+
+    if key in ("o", "O"):
+        with state.lock:
+            state.smooth = not state.smooth
+            state.status = f"SMOOTH CPU {'ON' if state.smooth else 'OFF'}"
         state.ui_event.set()
         return
 
@@ -380,42 +721,109 @@ def _build_table(view):
         pad_edge=False,
         row_styles=["none", "dim"],
     )
-    table.add_column("PID", justify="right", width=6, no_wrap=True, overflow="crop")
-    table.add_column("USER", justify="left", width=10, no_wrap=True, overflow="crop")
-    table.add_column("CPU%", justify="right", width=5, no_wrap=True, overflow="crop")
-    table.add_column("MEM USAGE", justify="right", width=9, no_wrap=True, overflow="crop")
-    table.add_column("COMMAND", justify="left", overflow="crop")
+    headers = {
+        "pid": "PID",
+        "user": "USER",
+        "cpu": "AVG%" if view.get("smooth") else "CPU%",
+        "mem": "MEM USAGE",
+        "name": "TREE" if view.get("tree_mode") else "COMMAND",
+    }
+    sort = view.get("sort")
+    if sort:
+        headers[sort[0]] += "▼" if sort[1] else "▲"
+    table.add_column(headers["pid"], justify="right", width=6, no_wrap=True, overflow="crop")
+    table.add_column(headers["user"], justify="left", width=10, no_wrap=True, overflow="crop")
+    table.add_column(headers["cpu"], justify="right", width=5, no_wrap=True, overflow="crop")
+    table.add_column(headers["mem"], justify="right", width=10, no_wrap=True, overflow="crop")
+    table.add_column(headers["name"], justify="left", overflow="crop")
 
     selected = view["selected_idx"]
     scroll = view["scroll"]
+    marked = view.get("marked") or ()
     for i, row in enumerate(view["visible"]):
         real_i = scroll + i
-        style = "bold white on red" if real_i == selected else None
+        is_marked = row.get("key") in marked
+        if real_i == selected:
+            style = "bold white on red"
+        elif is_marked:
+            style = "bold yellow"
+        else:
+            style = None
         mem_str = f"{row.get('mem', 0)} MB"
         table.add_row(
-            str(row.get("pid", "?")),
+            ("*" if is_marked else "") + str(row.get("pid", "?")),
             str(row.get("user", "?")),
-            f"{row.get('cpu', 0.0):.1f}",
+            f"{row.get('cpu_avg' if view.get('smooth') else 'cpu', 0.0):.1f}",
             mem_str,
-            str(row.get("name", "?")),
+            str(row.get("label") or row.get("name", "?")),
             style=style,
         )
 
     return table
 
 
+def _build_stats(stats, redraw=None):
+    table = Table(
+        expand=False,
+        show_header=True,
+        header_style="bold yellow",
+        box=None,
+        pad_edge=False,
+    )
+    table.add_column("PHASE", justify="left", width=10, no_wrap=True)
+    for column in ("LAST", "P50", "P95", "MAX"):
+        table.add_column(f"{column} ms", justify="right", width=9, no_wrap=True)
+
+    phases = stats.get("phases", {})
+    for name in PHASES:
+        phase = phases.get(name, {})
+        table.add_row(
+            name,
+            f"{phase.get('last', 0.0):.2f}",
+            f"{phase.get('p50', 0.0):.2f}",
+            f"{phase.get('p95', 0.0):.2f}",
+            f"{phase.get('max', 0.0):.2f}",
+        )
+
+    counts = stats.get("counts", {})
+    summary = "  ".join(f"{name}={value}" for name, value in sorted(counts.items()))
+    lines = [table, Text(summary, style="dim", no_wrap=True, overflow="crop")]
+    if redraw:
+        lines.append(
+            Text(
+                f"redraw: {redraw['lines_last']} lines {redraw['bytes_last']} B last frame, "
+                f"avg {redraw['lines_avg']:.1f} lines {redraw['bytes_avg']:.0f} B "
+                f"over {redraw['frames']} frames",
+                style="dim",
+                no_wrap=True,
+                overflow="crop",
+            )
+        )
+    return Group(*lines)
+
+
 def _keys_line():
     line = Text()
     line.append("[UP/DN] ", style="bold magenta")
     line.append("Navigate  ", style="white")
     line.append("[K] ", style="bold red")
     line.append("Kill  ", style="white")
+    line.append("[SPACE/A/U] ", style="bold yellow")
+    line.append("Mark/All/None  ", style="white")
     line.append("[T] ", style="bold blue")
     line.append("Kill Tree  ", style="white")
+    line.append("[X] ", style="bold red")
+    line.append("Suppress  ", style="white")
     line.append("[/] ", style="bold green")
     line.append("Filter  ", style="white")
+    line.append("[S/I/O] ", style="bold green")
+    line.append("Sort/Invert/Smooth  ", style="white")
     line.append("[R] ", style="bold cyan")
     line.append("Refresh  ", style="white")
+    line.append("[V] ", style="bold cyan")
+    line.append("Tree  ", style="white")
+    line.append("[D] ", style="bold yellow")
+    line.append("Stats  ", style="white")
     line.append("[Q] ", style="bold magenta")
     line.append("Quit", style="white")
     return line
@@ -562,18 +970,28 @@ def _render_ui(view):
         filter_line = Text(f"FILTER: {view['filter_text']}", style="dim")
     else:
         filter_line = Text("")
+    if view.get("matched", 0) > len(view["rows"]):
+        filter_line.append(f"  TOP {len(view['rows'])} OF {view['matched']}", style="yellow")
+    if view.get("filter_error"):
+        filter_line.append(f"  ({view['filter_error']})", style="bold red")
+    if view.get("marked"):
+        filter_line.append(f"  MARKED: {len(view['marked'])}", style="bold yellow")
 
     status_line = Text(f"STATUS: {view['status']}", style="dim")
-    group = Group(
+    pending, running = view.get("jobs", (0, 0))
+    if pending or running:
+        status_line.append(f"  [JOBS queued {pending} running {running}]", style="bold yellow")
+    parts = [
         header_grid,
         Rule(style="grey37"),
         filter_line,
         Rule(style="grey37"),
         _build_table(view),
-        Rule(style="grey37"),
-        status_line,
-        _keys_line(),
-    )
+    ]
+    if view.get("stats") is not None:
+        parts.extend([Rule(style="grey37"), _build_stats(view["stats"], view.get("redraw"))])
+    parts.extend([Rule(style="grey37"), status_line, _keys_line()])
+    group = Group(*parts)
 
     return Panel(
         group,
@@ -605,8 +1023,10 @@ def beep_worker(state):
             pass
 
 
-def _calc_max_rows(height):
+def _calc_max_rows(height, show_stats=False):
     reserved = LOGO_HEIGHT + 8
+    if show_stats:
+        reserved += STATS_OVERLAY_HEIGHT
     return max(1, height - reserved)
 
 def _enable_vt_mode():
@@ -687,7 +1107,7 @@ def _ui_loop_conhost(state):
     try:
         while state.running:
             width, height = _get_terminal_size()
-            max_rows = _calc_max_rows(height)
+            max_rows = _calc_max_rows(height, state.show_stats)
 
             if (width, height) != console_size:
                 console = Console(
@@ -702,6 +1122,7 @@ def _ui_loop_conhost(state):
 
             key = _read_key()
             if key is not None:
+                _note_input(state)
                 view = _build_view(state, max_rows)
                 dirty = True
                 if view["filter_mode"]:
@@ -721,9 +1142,11 @@ def _ui_loop_conhost(state):
                     line = lines[i]
                     if i >= len(prev_lines) or line != prev_lines[i]:
                         out.append(f"\x1b[{i + 1};1H{line}\x1b[0K")
-                if out:
-                    sys.stdout.write("".join(out))
+                payload = "".join(out)
+                if payload:
+                    sys.stdout.write(payload)
                     sys.stdout.flush()
+                state.redraw.record(len(out), len(payload.encode("utf-8")))
                 prev_lines = lines
                 dirty = False
 
@@ -746,9 +1169,10 @@ def _ui_loop_rich(state):
         dirty = True
         while state.running:
             height = console.size.height
-            max_rows = _calc_max_rows(height)
+            max_rows = _calc_max_rows(height, state.show_stats)
             key = _read_key()
             if key is not None:
+                _note_input(state)
                 view = _build_view(state, max_rows)
                 dirty = True
                 if view["filter_mode"]:
@@ -772,19 +1196,26 @@ def _ui_loop_rich(state):
 
 
 def ui_loop(state):
-    if os.getenv("WT_SESSION"):
-        _ui_loop_rich(state)
-    else:
-        _ui_loop_conhost(state)
+    with _terminal_input():
+        if os.getenv("WT_SESSION"):
+            _ui_loop_rich(state)
+        else:
+            _ui_loop_conhost(state)
 
 
-def _main():
+def _main(stats_jsonl=None):
     state = SharedState()
-    threading.Thread(target=collect_snapshot, args=(state,), daemon=True).start()
-    threading.Thread(target=action_worker, args=(state,), daemon=True).start()
+    instrumentation = Instrumentation(stats_jsonl)
+    threading.Thread(
+        target=collect_snapshot, args=(state, instrumentation), daemon=True
+    ).start()
+    start_action_workers(state)
     threading.Thread(target=beep_worker, args=(state,), daemon=True).start()
-    ui_loop(state)
+    try:
+        ui_loop(state)
+    finally:
+        instrumentation.close()
 
 
-def run():
-    _main()
+def run(stats_jsonl=None):
+    _main(stats_jsonl)
@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+USER_CACHE_SIZE = 8192
+RESOLVER_WORKERS = 2
+PENDING_USER = "..."
+
+
+class UsernameResolver:
+    def __init__(self, resolve, max_size=USER_CACHE_SIZE, workers=RESOLVER_WORKERS):
+        self._resolve = resolve
+        self._max_size = max(1, int(max_size))
+        self._cache = OrderedDict()
+        self._pending = set()
+        self._done = []
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "resolved": 0,
+            "evicted": 0,
+            "latency_total": 0.0,
+            "latency_max": 0.0,
+        }
+        for i in range(max(1, int(workers))):
+            threading.Thread(
+                target=self._worker, name=f"die-user-{i}", daemon=True
+            ).start()
+
+    def lookup(self, key, name):
+        with self._lock:
+            user = self._cache.get(key)
+            if user is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return user
+            self.stats["misses"] += 1
+            if key in self._pending:
+                return PENDING_USER
+            self._pending.add(key)
+        self._jobs.put((key, name))
+        return PENDING_USER
+
+    def store(self, key, user):
+        with self._lock:
+            self._put(key, user)
+
+    def forget(self, keys):
+        with self._lock:
+            for key in keys:
+                self._pending.discard(key)
+                if self._cache.pop(key, None) is not None:
+                    self.stats["evicted"] += 1
+
+    def drain(self):
+        with self._lock:
+            done, self._done = self._done, []
+        return done
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def stats_snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._cache)
+            stats["pending"] = len(self._pending)
+        resolved = stats["resolved"]
+        stats["latency_avg"] = stats["latency_total"] / resolved if resolved else 0.0
+        return stats
+
+    def _put(self, key, user):
+        self._cache[key] = user
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def _worker(self):
+        while True:
+            key, name = self._jobs.get()
+            t0 = time.perf_counter()
+            try:
+                user = self._resolve(key[0], name) or "UNKNOWN"
+            except Exception:
+                user = "UNKNOWN"
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self.stats["resolved"] += 1
+                self.stats["latency_total"] += elapsed
+                if elapsed > self.stats["latency_max"]:
+                    self.stats["latency_max"] = elapsed
+                if key not in self._pending:
+                    continue
+                self._pending.discard(key)
+                self._put(key, user)
+                self._done.append((key, user))
@@ -0,0 +1,178 @@
+import ctypes
+import os
+import threading
+from ctypes import wintypes
+
+PROCESS_TERMINATE = 0x0001
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+READ_CONTROL = 0x00020000
+TOKEN_QUERY = 0x0008
+TOKEN_ADJUST_PRIVILEGES = 0x0020
+SE_PRIVILEGE_ENABLED = 0x00000002
+SE_KERNEL_OBJECT = 6
+OWNER_SECURITY_INFORMATION = 0x00000001
+TokenUser = 1
+WTS_CURRENT_SERVER_HANDLE = 0
+WTSUserName = 5
+WTSDomainName = 7
+
+
+class LUID(ctypes.Structure):
+    _fields_ = [("LowPart", wintypes.DWORD), ("HighPart", wintypes.LONG)]
+
+
+class LUID_AND_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [("Luid", LUID), ("Attributes", wintypes.DWORD)]
+
+
+class TOKEN_PRIVILEGES(ctypes.Structure):
+    _fields_ = [("PrivilegeCount", wintypes.DWORD), ("Privileges", LUID_AND_ATTRIBUTES)]
+
+
+class SID_AND_ATTRIBUTES(ctypes.Structure):
+    _fields_ = [("Sid", wintypes.LPVOID), ("Attributes", wintypes.DWORD)]
+
+
+class TOKEN_USER(ctypes.Structure):
+    _fields_ = [("User", SID_AND_ATTRIBUTES)]
+
+
+_PROTOTYPES = {
+    "kernel32": {
+        "GetCurrentProcess": ([], wintypes.HANDLE),
+        "OpenProcess": ([wintypes.DWORD, wintypes.BOOL, wintypes.DWORD], wintypes.HANDLE),
+        "CloseHandle": ([wintypes.HANDLE], wintypes.BOOL),
+        "LocalFree": ([wintypes.HLOCAL], wintypes.HLOCAL),
+        "ProcessIdToSessionId": (
+            [wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)],
+            wintypes.BOOL,
+        ),
+        "CreateJobObjectW": ([wintypes.LPVOID, wintypes.LPCWSTR], wintypes.HANDLE),
+        "AssignProcessToJobObject": ([wintypes.HANDLE, wintypes.HANDLE], wintypes.BOOL),
+        "TerminateJobObject": ([wintypes.HANDLE, wintypes.UINT], wintypes.BOOL),
+    },
+    "advapi32": {
+        "OpenProcessToken": (
+            [wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)],
+            wintypes.BOOL,
+        ),
+        "LookupPrivilegeValueW": (
+            [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.POINTER(LUID)],
+            wintypes.BOOL,
+        ),
+        "AdjustTokenPrivileges": (
+            [
+                wintypes.HANDLE,
+                wintypes.BOOL,
+                ctypes.c_void_p,
+                wintypes.DWORD,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+            ],
+            wintypes.BOOL,
+        ),
+        "LookupAccountSidW": (
+            [
+                wintypes.LPCWSTR,
+                wintypes.LPVOID,
+                wintypes.LPWSTR,
+                ctypes.POINTER(wintypes.DWORD),
+                wintypes.LPWSTR,
+                ctypes.POINTER(wintypes.DWORD),
+                ctypes.POINTER(wintypes.DWORD),
+            ],
+            wintypes.BOOL,
+        ),
+        "ConvertStringSidToSidW": (
+            [wintypes.LPCWSTR, ctypes.POINTER(wintypes.LPVOID)],
+            wintypes.BOOL,
+        ),
+        "GetTokenInformation": (
+            [
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.LPVOID,
+                wintypes.DWORD,
+                ctypes.POINTER(wintypes.DWORD),
+            ],
+            wintypes.BOOL,
+        ),
+        "GetSecurityInfo": (
+            [
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                ctypes.POINTER(wintypes.LPVOID),
+                ctypes.POINTER(wintypes.LPVOID),
+                ctypes.POINTER(wintypes.LPVOID),
+                ctypes.POINTER(wintypes.LPVOID),
+                ctypes.POINTER(wintypes.LPVOID),
+            ],
+            wintypes.DWORD,
+        ),
+    },
+    "wtsapi32": {
+        "WTSQuerySessionInformationW": (
+            [
+                wintypes.HANDLE,
+                wintypes.DWORD,
+                wintypes.DWORD,
+                ctypes.POINTER(wintypes.LPWSTR),
+                ctypes.POINTER(wintypes.DWORD),
+            ],
+            wintypes.BOOL,
+        ),
+        "WTSFreeMemory": ([wintypes.LPVOID], None),
+    },
+}
+
+
+class _Bindings:
+    available = True
+
+    def __init__(self):
+        for dll_name, functions in _PROTOTYPES.items():
+            dll = ctypes.WinDLL(dll_name, use_last_error=True)
+            for func_name, (argtypes, restype) in functions.items():
+                func = getattr(dll, func_name)
+                func.argtypes = argtypes
+                func.restype = restype
+                setattr(self, func_name, func)
+
+
+def _failing_call(restype):
+    result = None if restype is None else 0
+
+    def call(*args):
+        return result
+
+    return call
+
+
+class _StubBindings:
+    available = False
+
+    def __init__(self):
+        for functions in _PROTOTYPES.values():
+            for func_name, (argtypes, restype) in functions.items():
+                setattr(self, func_name, _failing_call(restype))
+
+
+_BINDINGS = None
+_BINDINGS_LOCK = threading.Lock()
+
+
+def load():
+    global _BINDINGS
+    if _BINDINGS is None:
+        with _BINDINGS_LOCK:
+            if _BINDINGS is None:
+                bindings = None
+                if os.name == "nt":
+                    try:
+                        bindings = _Bindings()
+                    except Exception:
+                        bindings = None
+                _BINDINGS = bindings or _StubBindings()
+    return _BINDINGS
@@ -9,8 +9,13 @@ def _print_help_and_exit():
 
     text = (
         "die-cli - Windows process exterminator\n"
-        "Usage: die-cli [--version|-v] [--help|-h]\n"
-        "Run the TUI (admin required): die-cli"
+        "Usage: die-cli [--version|-v] [--help|-h] [--stats-jsonl PATH]\n"
+        "       die-cli --once|--watch [SECONDS] [--format json|ndjson|csv]\n"
+        "               [--columns pid,ppid,name,user,cpu,mem] [--top N] [--count N]\n"
+        "Run the TUI (admin required): die-cli\n"
+        "  --stats-jsonl PATH  append per-tick collector timings to PATH as JSON lines\n"
+        "  --once              print one snapshot (json by default) and exit\n"
+        "  --watch [SECONDS]   stream snapshots (ndjson by default), no TUI"
     )
     print(text)
     sys.exit(0)
@@ -23,12 +28,29 @@ def _print_version_and_exit():
     sys.exit(0)
 
 
+def _option_value(args, name):
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith(name + "="):
+            return arg[len(name) + 1 :]
+    return None
+
+
+def _run_headless_and_exit(args):
+    from die_cli.headless import run as run_headless
+
+    sys.exit(run_headless(args))
+
+
 def _handle_cli_flags():
     args = sys.argv[1:]
     if any(arg in ("-h", "--help") for arg in args):
         _print_help_and_exit()
     if any(arg in ("-v", "--version") for arg in args):
         _print_version_and_exit()
+    if any(arg in ("--once", "--watch") or arg.startswith("--watch=") for arg in args):
+        _run_headless_and_exit(args)
 
 
 def _is_admin():
@@ -66,4 +88,4 @@ from die_cli.tui import run
 
 
 if __name__ == "__main__":
-    run()
+    run(stats_jsonl=_option_value(sys.argv[1:], "--stats-jsonl"))
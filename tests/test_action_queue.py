@@ -0,0 +1,86 @@
+import queue
+
+import pytest
+
+from die_cli.actions import ActionQueue
+
+
+def _job(kind, pid, members=None):
+    job = {"kind": kind, "pid": pid, "key": (pid, 1.0), "name": f"p{pid}"}
+    if members is not None:
+        job["members"] = tuple((member, 1.0) for member in members)
+    return job
+
+
+def _drain(actions):
+    jobs = []
+    while True:
+        try:
+            job = actions.get(timeout=0.01)
+        except queue.Empty:
+            return jobs
+        jobs.append(job)
+        actions.done(job)
+
+
+def test_duplicate_kill_is_coalesced():
+    actions = ActionQueue()
+    assert actions.put(_job("KILL", 10))
+    assert not actions.put(_job("KILL", 10))
+    assert actions.depth() == (1, 0)
+    assert [job["pid"] for job in _drain(actions)] == [10]
+
+
+def test_same_pid_new_create_time_is_not_coalesced():
+    actions = ActionQueue()
+    assert actions.put(_job("KILL", 10))
+    reused = _job("KILL", 10)
+    reused["key"] = (10, 2.0)
+    assert actions.put(reused)
+    assert len(_drain(actions)) == 2
+
+
+def test_tree_supersedes_pending_singles():
+    actions = ActionQueue()
+    actions.put(_job("KILL", 10))
+    actions.put(_job("KILL", 11))
+    assert actions.put(_job("KILL_TREE", 10, members=[11, 12]))
+    assert actions.depth() == (1, 0)
+    assert [job["kind"] for job in _drain(actions)] == ["KILL_TREE"]
+
+
+def test_tree_members_block_later_singles():
+    actions = ActionQueue()
+    actions.put(_job("KILL_TREE", 10, members=[11]))
+    assert not actions.put(_job("KILL", 11))
+    assert not actions.put(_job("KILL", 10))
+    _drain(actions)
+    assert actions.put(_job("KILL", 11))
+
+
+@pytest.mark.parametrize("first,second", [("SUPPRESS", "KILL_TREE"), ("KILL_TREE", "SUPPRESS")])
+def test_tree_kinds_block_each_other(first, second):
+    actions = ActionQueue()
+    assert actions.put(_job(first, 10, members=[11]))
+    assert not actions.put(_job(second, 10, members=[11]))
+    assert [job["kind"] for job in _drain(actions)] == [first]
+
+
+def test_running_job_is_not_superseded():
+    actions = ActionQueue()
+    actions.put(_job("KILL", 10))
+    running = actions.get(timeout=0.01)
+    assert actions.put(_job("KILL_TREE", 10, members=[11]))
+    assert not running.get("superseded")
+    actions.done(running)
+    assert [job["kind"] for job in _drain(actions)] == ["KILL_TREE"]
+
+
+def test_batches_bypass_dedupe():
+    actions = ActionQueue()
+    members = ((10, 1.0),)
+    assert actions.put({"kind": "KILL_BATCH", "members": members})
+    assert actions.put({"kind": "KILL_BATCH", "members": members})
+    assert actions.depth() == (2, 0)
+    assert len(_drain(actions)) == 2
+    assert actions.depth() == (0, 0)
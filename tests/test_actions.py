@@ -0,0 +1,18 @@
+import psutil
+
+from die_cli import actions
+
+
+def test_snapshot_members_counts_inaccessible_members(monkeypatch):
+    def pinned(pid, key):
+        if pid == 2:
+            raise psutil.AccessDenied(pid)
+        if pid == 3:
+            raise actions.PidReused(pid)
+        if pid == 4:
+            raise psutil.NoSuchProcess(pid)
+        return pid
+
+    monkeypatch.setattr(actions, "pinned_process", pinned)
+    members = [(pid, 1.0) for pid in (1, 2, 3, 4, 5)]
+    assert actions._snapshot_members(members) == ([1, 5], 1, 1)
@@ -0,0 +1,62 @@
+from die_cli.fuzzy import FuzzyIndex
+from die_cli.process_snapshot import Snapshot
+from die_cli.process_table import ProcessTable
+from die_cli.process_tree import TreeIndex
+
+
+class Record:
+    def __init__(self, pid, name, user="root"):
+        self.key = (pid, 1.0)
+        self.pid = pid
+        self.ppid = 0
+        self.started = 1.0
+        self.cpu = 0.0
+        self.cpu_avg = 0.0
+        self.mem = 1
+        self.name = name
+        self.user = user
+        self.name_key = name.lower()
+        self.user_key = user.lower()
+        self.pid_key = str(pid)
+
+
+class FakeFetcher:
+    def __init__(self):
+        self.requested = []
+        self.ready = []
+
+    def request(self, keys):
+        self.requested.extend(keys)
+        self.ready.extend((key, f"/usr/bin/{key[0]} --serve") for key in keys)
+
+    def drain(self, limit=500):
+        ready, self.ready = self.ready, []
+        return ready
+
+
+def _snapshot(version, records):
+    table = ProcessTable.from_records(records)
+    return Snapshot(version, 0.0, table, table.rows(), TreeIndex(table))
+
+
+def test_rebuild_keeps_fetched_cmdlines():
+    fetcher = FakeFetcher()
+    index = FuzzyIndex(fetcher)
+    records = [Record(pid, f"proc{pid}") for pid in range(1, 21)]
+    index.update(_snapshot(1, records), [])
+    index.update(_snapshot(1, records), [])
+    assert len(fetcher.requested) == 20
+
+    records.append(Record(99, "late"))
+    index.update(_snapshot(40, records), [])
+    assert [key[0] for key in fetcher.requested[20:]] == [99]
+    index.update(_snapshot(40, records), [])
+    assert any(doc[0] == "cmd" for doc in index.key_docs[(5, 1.0)])
+
+
+def test_search_reports_matches_beyond_limit():
+    index = FuzzyIndex(FakeFetcher())
+    index.update(_snapshot(1, [Record(pid, "chrome.exe") for pid in range(1, 31)]), [])
+    assert len(index.search("chrome", limit=10)) == 10
+    assert index.matched == 30
+    assert len(index.search("chrome", limit=None)) == 30
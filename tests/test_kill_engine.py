@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from die_cli.kill_engine import kill_tree
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="spawns POSIX process groups"
+)
+
+TREE_SCRIPT = r"""
+import subprocess, sys, time
+fanout, depth = int(sys.argv[1]), int(sys.argv[2])
+children = [
+    subprocess.Popen([sys.executable, "-c", sys.argv[3], str(fanout), str(depth - 1), sys.argv[3]])
+    for _ in range(fanout if depth > 0 else 0)
+]
+while True:
+    time.sleep(60)
+"""
+READY_TIMEOUT = 30.0
+
+
+def _group_alive(pgid):
+    alive = 0
+    for proc in psutil.process_iter():
+        try:
+            if os.getpgid(proc.pid) == pgid and proc.status() != psutil.STATUS_ZOMBIE:
+                alive += 1
+        except Exception:
+            continue
+    return alive
+
+
+def _spawn_tree(fanout, depth):
+    root = subprocess.Popen(
+        [sys.executable, "-c", TREE_SCRIPT, str(fanout), str(depth), TREE_SCRIPT],
+        start_new_session=True,
+    )
+    expected = sum(fanout**level for level in range(depth + 1))
+    deadline = time.monotonic() + READY_TIMEOUT
+    while _group_alive(root.pid) < expected:
+        if time.monotonic() > deadline:
+            os.killpg(root.pid, 9)
+            pytest.fail(f"tree never reached {expected} processes")
+        time.sleep(0.05)
+    return root
+
+
+@pytest.mark.parametrize("strategy", ["auto", "walk"])
+def test_kill_tree_leaves_no_survivors(strategy):
+    root = _spawn_tree(3, 2)
+    try:
+        parent = psutil.Process(root.pid)
+        procs = parent.children(recursive=True) + [parent]
+        wave, used = kill_tree(parent, procs, strategy)
+        assert wave.ok
+        assert used == ("pgroup" if strategy == "auto" else "walk")
+        assert _group_alive(root.pid) == 0
+    finally:
+        try:
+            os.killpg(root.pid, 9)
+        except Exception:
+            pass
+        root.wait(timeout=5)
+
+
+def test_pgroup_strategy_spares_non_descendant_group_members():
+    leader = subprocess.Popen(["sleep", "100"], process_group=0)
+    sibling = subprocess.Popen(["sleep", "200"], process_group=leader.pid)
+    try:
+        parent = psutil.Process(leader.pid)
+        wave, used = kill_tree(parent, [parent], "auto")
+        assert wave.ok
+        assert used == "walk"
+        leader.wait(timeout=5)
+        assert sibling.poll() is None
+    finally:
+        for proc in (leader, sibling):
+            proc.kill()
+            proc.wait(timeout=5)
@@ -0,0 +1,68 @@
+from die_cli.services import ServiceUserMap
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _service_map(mappings, **kwargs):
+    calls = []
+
+    def provider():
+        calls.append(1)
+        result = mappings[min(len(calls), len(mappings)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    clock = FakeClock()
+    return ServiceUserMap(provider=provider, clock=clock, **kwargs), clock, calls
+
+
+def test_first_refresh_runs_immediately():
+    services, _, calls = _service_map([{10: "NT AUTHORITY\\SYSTEM"}])
+    assert services.refresh_if_due()
+    assert services.lookup(10) == "NT AUTHORITY\\SYSTEM"
+    assert len(calls) == 1
+
+
+def test_refresh_waits_for_interval():
+    services, clock, calls = _service_map([{10: "a"}, {10: "b"}], interval=30, min_interval=2)
+    services.refresh_if_due()
+    clock.now += 29
+    assert not services.refresh_if_due()
+    clock.now += 1
+    assert services.refresh_if_due()
+    assert services.lookup(10) == "b"
+    assert len(calls) == 2
+
+
+def test_unknown_service_host_forces_early_refresh():
+    services, clock, calls = _service_map([{}, {20: "LOCAL SERVICE"}], interval=30, min_interval=2)
+    services.refresh_if_due()
+    assert services.lookup(20, "svchost.exe") is None
+    clock.now += 1
+    assert not services.refresh_if_due()
+    clock.now += 1
+    assert services.refresh_if_due()
+    assert services.lookup(20, "svchost.exe") == "LOCAL SERVICE"
+
+
+def test_unknown_non_host_does_not_mark_stale():
+    services, clock, _ = _service_map([{}], interval=30, min_interval=2)
+    services.refresh_if_due()
+    services.lookup(20, "notepad.exe")
+    clock.now += 5
+    assert not services.refresh_if_due()
+
+
+def test_provider_failure_keeps_previous_mapping():
+    services, clock, _ = _service_map([{10: "a"}, RuntimeError("scm down")], interval=30)
+    services.refresh_if_due()
+    clock.now += 30
+    assert services.refresh_if_due()
+    assert services.lookup(10) == "a"
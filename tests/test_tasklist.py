@@ -0,0 +1,58 @@
+import sys
+import time
+
+from die_cli.tasklist import TasklistJob, parse_tasklist_rows
+
+HEADER = '"Image Name","PID","Session Name","Session#","Mem Usage","Status","User Name"'
+
+
+def _row(name, pid, user):
+    return f'"{name}","{pid}","Console","1","1,024 K","Running","{user}"'
+
+
+def _wait(job, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while job.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not job.running()
+
+
+def test_parse_skips_missing_users_and_bad_rows():
+    lines = [
+        HEADER,
+        _row("svchost.exe", 100, "NT AUTHORITY\\SYSTEM"),
+        _row("idle", 0, "NT AUTHORITY\\SYSTEM"),
+        _row("x.exe", 101, "N/A"),
+        _row("y.exe", "abc", "DOMAIN\\bob"),
+        '"short","1"',
+    ]
+    assert list(parse_tasklist_rows(lines)) == [(100, "NT AUTHORITY\\SYSTEM")]
+
+
+def test_job_runs_command_in_background_and_drains():
+    lines = [HEADER] + [_row("p.exe", pid, f"DOMAIN\\user{pid}") for pid in range(1, 201)]
+    script = "\n".join(f"print({line!r})" for line in lines)
+    job = TasklistJob(cmd=[sys.executable, "-c", script])
+    assert job.enabled
+    assert job.start()
+    _wait(job)
+    results = job.drain()
+    assert len(results) == 200
+    assert results[7] == "DOMAIN\\user7"
+    assert job.drain() == {}
+    assert job.runs == 1
+
+
+def test_job_timeout_kills_hung_command():
+    job = TasklistJob(cmd=[sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+    job.start()
+    _wait(job)
+    assert job.drain() == {}
+    assert job.last_duration < 5
+
+
+def test_job_disabled_without_command(monkeypatch):
+    monkeypatch.setattr("die_cli.tasklist.os.name", "posix")
+    job = TasklistJob()
+    assert not job.enabled
+    assert not job.start()